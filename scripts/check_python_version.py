@@ -6,6 +6,7 @@ Python 版本检查脚本
 
 import sys
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 REQUIRED_PYTHON_VERSION = (3, 12, 0)
@@ -51,10 +52,11 @@ def check_dependencies():
     missing_modules = []
 
     for module in required_modules:
-        try:
-            __import__(module)
+        # find_spec 只查询导入器是否能找到模块，不会真正执行导入，
+        # 避免为了检测存在性而加载 fastapi/sqlalchemy 这类重量级包
+        if find_spec(module) is not None:
             print(f"[OK] {module}")
-        except ImportError:
+        else:
             print(f"[MISSING] {module}")
             missing_modules.append(module)
 
@@ -7,40 +7,55 @@ Python 版本要求: Python 3.12+
 """
 
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+def _copy_one(template_file: Path, target_file: Path) -> bool:
+    """复制单个环境文件（copyfile 跳过权限位复制，模板不需要保留mode）"""
+    try:
+        shutil.copyfile(template_file, target_file)
+        return True
+    except Exception as e:
+        print(f"错误: 创建 {target_file.name} 失败: {e}")
+        return False
+
 def create_env_files():
     """创建环境配置文件"""
     project_root = Path(__file__).parent.parent
     template_file = project_root / "env.template"
-    
+
     if not template_file.exists():
         print(f"错误: 未找到模板文件 {template_file}")
         return False
-    
+
     env_files = {
         ".env.dev": "开发环境",
         ".env.show": "展示环境",
         ".env.prod": "生产环境"
     }
-    
+
     created = []
     skipped = []
-    
+    tasks = []
+
     for env_file, description in env_files.items():
         target_file = project_root / env_file
-        
+
         if target_file.exists():
             print(f"跳过: {env_file} 已存在 ({description})")
             skipped.append(env_file)
         else:
-            try:
-                shutil.copy(template_file, target_file)
-                print(f"创建: {env_file} ({description})")
-                created.append(env_file)
-            except Exception as e:
-                print(f"错误: 创建 {env_file} 失败: {e}")
+            tasks.append((env_file, description, target_file))
+
+    # 并发复制：总耗时约等于单次复制耗时，而不是逐个相加
+    if tasks:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+            results = list(ex.map(lambda t: _copy_one(template_file, t[2]), tasks))
+        for (env_file, description, _), ok in zip(tasks, results):
+            if not ok:
                 return False
+            print(f"创建: {env_file} ({description})")
+            created.append(env_file)
     
     print("\n" + "="*50)
     print("环境文件创建完成！")
@@ -4,79 +4,122 @@ AgentOS 配置模块
 """
 
 import os
+import functools
 import logging
 from agno.os import AgentOS
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _minimal_agents() -> tuple:
+    """
+    构建最小智能体集合（延迟导入并缓存）
+
+    minimal 配置只注册工作流所需的核心智能体（意图识别、数据库查询、整合输出），
+    不注册讨论团队成员。
+    """
+    from src.engine.agents import (
+        create_intent_agent,
+        create_db_agent,
+        create_output_agent,
+    )
+    return (
+        create_intent_agent(),
+        create_db_agent(),
+        create_output_agent(),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _full_agents() -> tuple:
+    """
+    构建完整智能体集合（延迟导入并缓存）
+
+    仅在调用方未提供 agents 时导入和构造，避免启动时加载全部智能体模块。
+    使用 lru_cache 确保多次调用 create_agentos() 不会重复执行工厂代码。
+    """
+    from src.engine.teams import (
+        create_pro_agent,
+        create_con_agent,
+        create_leader_agent,
+    )
+    return _minimal_agents() + (
+        create_pro_agent(),
+        create_con_agent(),
+        create_leader_agent(),
+    )
+
+
+# profile 到默认智能体集合的映射
+_PROFILE_AGENTS = {
+    'full': _full_agents,
+    'minimal': _minimal_agents,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_teams() -> tuple:
+    """构建默认团队集合（延迟导入并缓存）"""
+    from src.engine.teams import create_discussion_team_for_agentos
+    return (create_discussion_team_for_agentos(),)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_workflows() -> tuple:
+    """构建默认工作流集合（延迟导入并缓存）"""
+    from src.engine.workflows.workflow import create_main_workflow
+    return (create_main_workflow(),)
+
+
 def create_agentos(base_app=None, **kwargs) -> AgentOS:
     """
     创建 AgentOS 实例
-    
+
     Args:
         base_app: FastAPI 应用实例（可选）
         **kwargs: 其他 AgentOS 参数
     """
+    # 配置 profile（full: 全部智能体+讨论团队；minimal: 仅核心智能体，不注册团队）
+    profile = kwargs.pop('profile', os.getenv('AGENTOS_PROFILE', 'full'))
+    if profile not in _PROFILE_AGENTS:
+        logger.warning(f"未知的 AgentOS profile: {profile}，回退到 full")
+        profile = 'full'
+
     # 如果没有提供 tracing_db，使用 Agno 专用数据库（用于追踪和知识库存储）
     if 'tracing_db' not in kwargs:
         from src.database.connection import get_agent_database
         kwargs['tracing_db'] = get_agent_database()
         logger.info("已配置 AgentOS 追踪数据库（用于追踪和知识库存储）")
-    
+
     # 确保自动配置数据库（AgentOS 会自动从环境变量读取数据库配置）
     if 'auto_provision_dbs' not in kwargs:
         kwargs['auto_provision_dbs'] = True
-    
-    # 如果没有提供 agents，默认添加所有智能体
+
+    # 如果没有提供 agents，按 profile 添加默认智能体（延迟导入并缓存）
     if 'agents' not in kwargs or not kwargs['agents']:
-        from src.engine.agents import (
-            create_intent_agent,
-            create_db_agent,
-            create_output_agent,
-        )
-        from src.engine.teams import (
-            create_pro_agent,
-            create_con_agent,
-            create_leader_agent,
-        )
-        intent_agent = create_intent_agent()
-        db_agent = create_db_agent()
-        output_agent = create_output_agent()
-        pro_agent = create_pro_agent()
-        con_agent = create_con_agent()
-        leader_agent = create_leader_agent()
-        kwargs['agents'] = [
-            intent_agent,
-            db_agent,
-            output_agent,
-            pro_agent,
-            con_agent,
-            leader_agent,
-        ]
-        logger.info("已自动注册所有智能体: Intent Agent, DB Agent, Output Agent, Pro Agent, Con Agent, Leader Agent")
-    
-    # 如果没有提供 teams，默认添加讨论团队
+        kwargs['agents'] = list(_PROFILE_AGENTS[profile]())
+        logger.info(f"已自动注册智能体（profile={profile}）: {', '.join(a.name for a in kwargs['agents'])}")
+
+    # 如果没有提供 teams，默认添加讨论团队（minimal 配置不注册团队）
     if 'teams' not in kwargs or not kwargs['teams']:
-        from src.engine.teams import create_discussion_team_for_agentos
-        discussion_team = create_discussion_team_for_agentos()
-        kwargs['teams'] = [discussion_team]
-        logger.info("已自动注册讨论团队")
-    
-    # 如果没有提供 workflows，默认添加主工作流
+        if profile == 'full':
+            kwargs['teams'] = list(_default_teams())
+            logger.info("已自动注册讨论团队")
+        else:
+            kwargs['teams'] = []
+
+    # 如果没有提供 workflows，默认添加主工作流（延迟导入并缓存）
     if 'workflows' not in kwargs:
-        from src.engine.workflows.workflow import create_main_workflow
-        main_workflow = create_main_workflow()
-        kwargs['workflows'] = [main_workflow]
+        kwargs['workflows'] = list(_default_workflows())
         logger.info("已自动注册主工作流")
-    
+
     # 从环境变量读取 tracing
     if 'tracing' not in kwargs:
         kwargs['tracing'] = os.getenv("AGENTOS_TRACING", "true").lower() == "true"
-    
+
     # 传入 base_app
     if base_app is not None:
         kwargs['base_app'] = base_app
-    
-    return AgentOS(id="my-agentos", **kwargs)
 
+    return AgentOS(id="my-agentos", **kwargs)
@@ -3,16 +3,20 @@ API Dependencies
 API 依赖注入定义
 """
 
-from functools import lru_cache
+from typing import Optional
 from src.database.query_tools import get_query_tools, DatabaseQueryTools
 
+# 模块级单例（延迟初始化，避免导入时建立数据库连接）
+_QUERY_TOOLS: Optional[DatabaseQueryTools] = None
+
 
-@lru_cache()
 def get_query_tools_dependency() -> DatabaseQueryTools:
     """
     获取查询工具实例（依赖注入）
-    
-    使用 lru_cache 确保在同一个请求中返回同一个实例
-    """
-    return get_query_tools()
 
+    使用模块级单例，避免每次请求经过 lru_cache 包装器的锁和字典查找开销
+    """
+    global _QUERY_TOOLS
+    if _QUERY_TOOLS is None:
+        _QUERY_TOOLS = get_query_tools()
+    return _QUERY_TOOLS
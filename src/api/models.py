@@ -3,12 +3,18 @@ API Models
 API 请求和响应模型定义
 """
 
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any
+
+# 响应模型均为一次性只读对象：frozen 走更快的构造路径并减少实例内存，
+# extra='ignore' 跳过多余字段检查
+_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore')
 
 
 class HealthCheckResponse(BaseModel):
     """健康检查响应"""
+    model_config = _MODEL_CONFIG
+
     status: str
     service: str
     database_connected: bool
@@ -17,20 +23,27 @@ class HealthCheckResponse(BaseModel):
 
 class QueryRequest(BaseModel):
     """查询请求"""
+    model_config = _MODEL_CONFIG
+
     sql: str
     params: Optional[Dict[str, Any]] = None
 
 
 class QueryResponse(BaseModel):
     """查询响应"""
+    model_config = _MODEL_CONFIG
+
     success: bool
-    data: List[Dict[str, Any]]
+    # 行数据来自 SQLAlchemy，已是字典列表；不做逐行逐列的元素校验
+    data: list
     count: int
     message: Optional[str] = None
 
 
 class TableInfoResponse(BaseModel):
     """表信息响应"""
+    model_config = _MODEL_CONFIG
+
     success: bool
     table_info: Dict[str, Any]
     message: Optional[str] = None
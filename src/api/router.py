@@ -3,8 +3,12 @@ API Router
 API 路由定义
 """
 
+import asyncio
 import logging
+import time
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List
 
 from .models import (
@@ -19,13 +23,28 @@ from src.database.query_tools import DatabaseQueryTools
 
 logger = logging.getLogger(__name__)
 
+class ORJSONStrResponse(ORJSONResponse):
+    """
+    ORJSONResponse 变体：对 orjson 原生不支持的类型回退为 str
+
+    数据库行里常见 Decimal、timedelta、bytes 等类型（MySQL 的
+    DECIMAL/TIME 列），orjson 默认会抛 TypeError；与流式路径的
+    default=str 行为保持一致。
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str)
+
+
 # 创建根路由器（用于健康检查等根路径路由）
-root_router = APIRouter()
+# 使用 ORJSONResponse 作为默认响应类，序列化大结果集比标准库 json 快数倍
+root_router = APIRouter(default_response_class=ORJSONResponse)
 
 # 创建 API 路由器
 api_router = APIRouter(
     prefix="/api",
-    tags=["API"]
+    tags=["API"],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -33,64 +52,125 @@ api_router = APIRouter(
 # 健康检查路由（根路径）
 # ============================================================================
 
+# 健康状态缓存（stale-while-revalidate）：探活请求可能每隔几秒触发一次，
+# 短 TTL 内直接返回缓存结果，过期时返回旧值并在后台刷新，避免阻塞事件循环
+_HEALTH_CACHE = {"ts": 0.0, "ok": False}
+_HEALTH_TTL = 2.0
+_health_refreshing = False
+
+# 预构建的响应对象：健康/不健康两种结果各只需构造一次 Pydantic 模型
+_HEALTHY_RESPONSE = HealthCheckResponse(
+    status="healthy",
+    service="agno-backend-api",
+    database_connected=True,
+    version="0.1.0"
+)
+_UNHEALTHY_RESPONSE = HealthCheckResponse(
+    status="unhealthy",
+    service="agno-backend-api",
+    database_connected=False,
+    version="0.1.0"
+)
+_ERROR_RESPONSE = HealthCheckResponse(
+    status="error",
+    service="agno-backend-api",
+    database_connected=False,
+    version="0.1.0"
+)
+
+
+async def _refresh_health():
+    """在线程中执行数据库探活并刷新健康状态缓存"""
+    global _health_refreshing
+    try:
+        ok = await asyncio.to_thread(check_database_connection)
+        _HEALTH_CACHE.update(ts=time.monotonic(), ok=ok)
+    except Exception as e:
+        logger.error(f"健康状态刷新失败: {e}")
+        _HEALTH_CACHE.update(ts=time.monotonic(), ok=False)
+    finally:
+        _health_refreshing = False
+
+
 @root_router.get("/health", response_model=HealthCheckResponse, tags=["Health"])
 async def health_check():
     """
     健康检查端点
-    
+
     Returns:
         HealthCheckResponse: 健康检查响应
     """
+    global _health_refreshing
     try:
-        db_connected = check_database_connection()
-        return HealthCheckResponse(
-            status="healthy" if db_connected else "unhealthy",
-            service="agno-backend-api",
-            database_connected=db_connected,
-            version="0.1.0"
-        )
+        now = time.monotonic()
+        if now - _HEALTH_CACHE["ts"] < _HEALTH_TTL:
+            # TTL 内直接使用缓存结果
+            db_connected = _HEALTH_CACHE["ok"]
+        elif _HEALTH_CACHE["ts"] > 0.0:
+            # 缓存过期：返回旧值，后台异步刷新（stale-while-revalidate）
+            db_connected = _HEALTH_CACHE["ok"]
+            if not _health_refreshing:
+                _health_refreshing = True
+                asyncio.create_task(_refresh_health())
+        else:
+            # 首次探活：在线程中执行，避免阻塞事件循环
+            db_connected = await asyncio.to_thread(check_database_connection)
+            _HEALTH_CACHE.update(ts=now, ok=db_connected)
+        return _HEALTHY_RESPONSE if db_connected else _UNHEALTHY_RESPONSE
     except Exception as e:
         logger.error(f"健康检查失败: {e}")
-        return HealthCheckResponse(
-            status="error",
-            service="agno-backend-api",
-            database_connected=False,
-            version="0.1.0"
-        )
+        return _ERROR_RESPONSE
 
 
 # ============================================================================
 # 数据库查询路由
 # ============================================================================
 
-@api_router.post("/query", response_model=QueryResponse, tags=["Database"])
+def _ndjson_generator(query_tools: DatabaseQueryTools, sql: str, params):
+    """逐行编码查询结果为NDJSON（内存占用与结果集大小无关）"""
+    for row in query_tools.stream_query(sql, params):
+        yield orjson.dumps(row, default=str) + b"\n"
+
+
+@api_router.post("/query", responses={200: {"model": QueryResponse}}, tags=["Database"])
 async def execute_query(
     request: QueryRequest,
+    stream: bool = False,
     query_tools: DatabaseQueryTools = Depends(get_query_tools_dependency)
 ):
     """
     执行数据库查询
-    
+
     Args:
         request: 查询请求
+        stream: 是否以NDJSON流式返回结果（适合大结果集）
         query_tools: 查询工具（依赖注入）
-    
+
     Returns:
-        QueryResponse: 查询响应
-    
+        QueryResponse: 查询响应（stream=true 时为 NDJSON 流）
+
     Raises:
         HTTPException: 查询执行失败
     """
     try:
-        # 执行查询
-        result = query_tools.execute_query(request.sql, request.params)
+        if stream:
+            # 流式返回：不在内存中物化整个结果集
+            return StreamingResponse(
+                _ndjson_generator(query_tools, request.sql, request.params),
+                media_type="application/x-ndjson"
+            )
+        # 执行查询（查询工具是同步引擎，放入线程执行避免阻塞事件循环）
+        result = await asyncio.to_thread(query_tools.execute_query, request.sql, request.params)
 
-        return QueryResponse(
-            success=True,
-            data=result,
-            count=len(result),
-            message="查询执行成功"
-        )
+        # 行数据已由数据库驱动产出，跳过 Pydantic 对每行每列的重复校验，
+        # 直接经 orjson 序列化（OpenAPI 模型通过 responses 声明）；
+        # default=str 兜底 Decimal/时间等驱动类型，与流式路径一致
+        return ORJSONStrResponse({
+            "success": True,
+            "data": result,
+            "count": len(result),
+            "message": "查询执行成功"
+        })
 
     except Exception as e:
         logger.error(f"查询执行失败: {e}")
@@ -117,7 +197,7 @@ async def list_tables(
         HTTPException: 获取表列表失败
     """
     try:
-        tables = query_tools.list_tables()
+        tables = await asyncio.to_thread(query_tools.list_tables)
         return tables
 
     except Exception as e:
@@ -147,7 +227,7 @@ async def get_table_info(
         HTTPException: 获取表信息失败
     """
     try:
-        table_info = query_tools.get_table_info(table_name)
+        table_info = await asyncio.to_thread(query_tools.get_table_info, table_name)
 
         return TableInfoResponse(
             success=True,
@@ -182,7 +262,7 @@ async def get_table_count(
         HTTPException: 获取表记录数失败
     """
     try:
-        count = query_tools.get_table_count(table_name)
+        count = await asyncio.to_thread(query_tools.get_table_count, table_name)
         return {"table": table_name, "count": count}
 
     except Exception as e:
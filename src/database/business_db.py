@@ -3,30 +3,75 @@ Business Database Connection Module
 业务数据库连接管理模块 - 支持同主机地址的多个业务数据库
 """
 
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
 from sqlalchemy import create_engine, Engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from sqlalchemy.orm import sessionmaker, Session
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _text(sql: str):
+    """缓存 text() 编译结果，固定形态的SQL不必每次重新解析绑定参数"""
+    return text(sql)
+
+
+# :name 形式的绑定参数标记（排除 :: 类型转换）
+_BIND_PARAM_RE = re.compile(r"(?<!:):\w+")
+
+
+def _warn_if_unparameterised(sql: str, params: Optional[Dict]):
+    """
+    对疑似把值直接拼进SQL的调用记录警告
+
+    统一使用 :name 绑定参数能让相同SQL模板命中 MySQL 的预编译语句缓存，
+    跳过服务端的重复解析和执行计划生成。
+    """
+    if params is None and "'" in sql and not _BIND_PARAM_RE.search(sql):
+        logger.warning(f"检测到未参数化的SQL（建议使用 :name 绑定参数以复用预编译语句）: {sql[:200]}")
+
+
 class BusinessDatabaseManager:
     """业务数据库连接管理器"""
 
+    __slots__ = ('_engines', '_async_engines', '_sessions', '_initialized',
+                 '_base_url', '_pool_size', '_pool_recycle', '_pool_timeout', '_echo',
+                 '_compiled_cache')
+
     def __init__(self):
         self._engines: Dict[str, Engine] = {}
+        self._async_engines: Dict[str, AsyncEngine] = {}
         self._sessions: Dict[str, sessionmaker] = {}
         self._initialized = False
+        self._base_url: Optional[str] = None
+        self._pool_size = 20
+        self._pool_recycle = 3600
+        self._pool_timeout = 10
+        self._echo = False
+        # 跨连接共享的SQL编译缓存（配合 _text 的稳定 TextClause 复用编译结果）
+        self._compiled_cache: Dict = {}
+        # 模块级单例只会构造一次，直接在这里完成初始化，
+        # 免去每个公开方法开头的 initialized 检查
+        self._initialize_databases()
 
-    def _get_base_url(self) -> str:
-        """获取基础数据库URL（不包含数据库名）"""
-        host = os.getenv("BUSINESS_MYSQL_HOST", os.getenv("MYSQL_HOST", "localhost"))
-        port = int(os.getenv("BUSINESS_MYSQL_PORT", os.getenv("MYSQL_PORT", "3306")))
-        user = os.getenv("BUSINESS_MYSQL_USER", os.getenv("MYSQL_USER", "root"))
-        password = os.getenv("BUSINESS_MYSQL_PASSWORD", os.getenv("MYSQL_PASSWORD", "password"))
-        return f"mysql+pymysql://{user}:{password}@{host}:{port}"
+    def _load_env_config(self):
+        """一次性读取环境变量配置（在首次初始化时执行）"""
+        env = os.environ.get
+        host = env("BUSINESS_MYSQL_HOST") or env("MYSQL_HOST", "localhost")
+        port = int(env("BUSINESS_MYSQL_PORT") or env("MYSQL_PORT", "3306"))
+        user = env("BUSINESS_MYSQL_USER") or env("MYSQL_USER", "root")
+        password = env("BUSINESS_MYSQL_PASSWORD") or env("MYSQL_PASSWORD", "password")
+        self._base_url = f"mysql+pymysql://{user}:{password}@{host}:{port}"
+        self._pool_size = int(env("MYSQL_POOL_SIZE", "20"))
+        self._pool_recycle = int(env("MYSQL_POOL_RECYCLE", "3600"))
+        self._pool_timeout = int(env("MYSQL_POOL_TIMEOUT", "10"))
+        self._echo = env("MYSQL_ECHO", "false").lower() == "true"
 
     def _initialize_databases(self):
         """初始化所有业务数据库连接"""
@@ -48,31 +93,47 @@ class BusinessDatabaseManager:
             self._initialized = True
             return
 
-        base_url = self._get_base_url()
-        pool_size = int(os.getenv("MYSQL_POOL_SIZE", "20"))
-        pool_recycle = int(os.getenv("MYSQL_POOL_RECYCLE", "3600"))
+        # 环境变量只在这里读取一次，之后的热路径不再访问 os.environ
+        self._load_env_config()
 
-        # 为每个数据库创建连接
-        for db_name in database_names:
-            try:
-                db_url = f"{base_url}/{db_name}?charset=utf8mb4"
-                engine = create_engine(
-                    db_url,
-                    pool_size=pool_size,
-                    pool_recycle=pool_recycle,
-                    echo=os.getenv("MYSQL_ECHO", "false").lower() == "true",
-                )
-                session_maker = sessionmaker(bind=engine)
+        # 引擎参数在循环外构建一次，所有数据库共享
+        engine_kwargs = dict(
+            pool_size=self._pool_size,
+            pool_recycle=self._pool_recycle,
+            pool_pre_ping=True,  # 取连接前先探活，避免拿到超时的死连接
+            pool_timeout=self._pool_timeout,
+            pool_use_lifo=True,  # LIFO 保持热连接常用，冷连接可被回收
+            echo=self._echo,
+        )
 
-                self._engines[db_name] = engine
-                self._sessions[db_name] = session_maker
+        # 先构建 (数据库名, URL) 列表，再统一创建引擎
+        targets = [(db_name, f"{self._base_url}/{db_name}?charset=utf8mb4")
+                   for db_name in database_names]
 
+        for db_name, db_url in targets:
+            try:
+                engine = create_engine(db_url, **engine_kwargs)
+                self._engines[db_name] = engine
+                self._sessions[db_name] = sessionmaker(bind=engine)
                 logger.debug(f"成功初始化业务数据库连接: {db_name}")
             except Exception as e:
                 logger.error(f"初始化业务数据库 {db_name} 失败: {e}")
 
         self._initialized = True
 
+        # 可选：并发预热连接池（首个请求不再付建连成本）
+        if os.getenv("MYSQL_POOL_WARMUP", "false").lower() == "true" and self._engines:
+            with ThreadPoolExecutor(max_workers=min(8, len(self._engines))) as pool:
+                list(pool.map(self._warmup, list(self._engines.keys())))
+
+    def _warmup(self, database_name: str):
+        """预热单个数据库的连接池（失败只记录，不影响启动）"""
+        try:
+            self._engines[database_name].connect().close()
+            logger.debug(f"业务数据库连接池预热完成: {database_name}")
+        except Exception as e:
+            logger.warning(f"业务数据库 {database_name} 连接池预热失败: {e}")
+
     def get_engine(self, database_name: str) -> Optional[Engine]:
         """
         获取指定数据库的引擎
@@ -83,9 +144,40 @@ class BusinessDatabaseManager:
         Returns:
             Engine 实例，如果数据库不存在返回 None
         """
-        self._initialize_databases()
+        # close_all() 之后的再初始化路径：正常运行时该分支恒为假，
+        # 只在连接被显式关闭后的下一次访问触发一次重建
+        if not self._initialized:
+            self._initialize_databases()
         return self._engines.get(database_name)
 
+    def get_async_engine(self, database_name: str) -> Optional[AsyncEngine]:
+        """
+        获取指定数据库的异步引擎（mysql+asyncmy，按需延迟创建）
+
+        Args:
+            database_name: 数据库名称
+
+        Returns:
+            AsyncEngine 实例，如果数据库不存在返回 None
+        """
+        if self.get_engine(database_name) is None:
+            return None
+        async_engine = self._async_engines.get(database_name)
+        if async_engine is None:
+            db_url = f"{self._base_url}/{database_name}?charset=utf8mb4".replace(
+                "mysql+pymysql://", "mysql+asyncmy://")
+            async_engine = create_async_engine(
+                db_url,
+                pool_size=self._pool_size,
+                pool_recycle=self._pool_recycle,
+                pool_pre_ping=True,
+                pool_timeout=self._pool_timeout,
+                echo=self._echo,
+            )
+            self._async_engines[database_name] = async_engine
+            logger.debug(f"成功初始化业务数据库异步连接: {database_name}")
+        return async_engine
+
     def get_session(self, database_name: str) -> Optional[Session]:
         """
         获取指定数据库的会话
@@ -96,7 +188,8 @@ class BusinessDatabaseManager:
         Returns:
             Session 实例，如果数据库不存在返回 None
         """
-        self._initialize_databases()
+        if not self._initialized:
+            self._initialize_databases()
         session_maker = self._sessions.get(database_name)
         if session_maker:
             return session_maker()
@@ -118,21 +211,73 @@ class BusinessDatabaseManager:
         if not engine:
             raise ValueError(f"业务数据库 {database_name} 不存在或未配置")
 
+        _warn_if_unparameterised(sql, params)
         try:
             with engine.connect() as conn:
-                if params:
-                    result = conn.execute(text(sql), params)
-                else:
-                    result = conn.execute(text(sql))
-
-                # 获取列名
-                columns = result.keys()
-                # 返回字典列表
-                return [dict(zip(columns, row)) for row in result.fetchall()]
+                result = conn.execution_options(
+                    compiled_cache=self._compiled_cache
+                ).execute(_text(sql), params or {})
+                # 使用 mappings() 走 SQLAlchemy 的 C 路径，避免逐行 dict(zip(...)) 的开销
+                return [dict(row) for row in result.mappings()]
         except Exception as e:
             logger.error(f"业务数据库查询失败 [{database_name}]: {sql}, 错误: {e}")
             raise
 
+    def stream_query(self, database_name: str, sql: str, params: Optional[Dict] = None, chunk: int = 1000):
+        """
+        在指定数据库中流式执行查询，逐行产出结果
+
+        服务端游标按 chunk 大小分批取回，内存占用为 O(chunk) 而不是 O(行数)，
+        适合可能返回大结果集的查询。
+
+        Args:
+            database_name: 数据库名称
+            sql: SQL查询语句
+            params: 查询参数
+            chunk: 每批取回的行数
+
+        Yields:
+            逐行的结果字典
+        """
+        engine = self.get_engine(database_name)
+        if not engine:
+            raise ValueError(f"业务数据库 {database_name} 不存在或未配置")
+
+        try:
+            with engine.connect() as conn:
+                result = conn.execution_options(
+                    stream_results=True, yield_per=chunk
+                ).execute(_text(sql), params or {})
+                for row in result.mappings():
+                    yield dict(row)
+        except Exception as e:
+            logger.error(f"业务数据库流式查询失败 [{database_name}]: {sql}, 错误: {e}")
+            raise
+
+    async def execute_query_async(self, database_name: str, sql: str, params: Optional[Dict] = None) -> List[Dict]:
+        """
+        在指定数据库中异步执行查询（不阻塞事件循环）
+
+        Args:
+            database_name: 数据库名称
+            sql: SQL查询语句
+            params: 查询参数
+
+        Returns:
+            查询结果列表
+        """
+        engine = self.get_async_engine(database_name)
+        if not engine:
+            raise ValueError(f"业务数据库 {database_name} 不存在或未配置")
+
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(_text(sql), params or {})
+                return [dict(row) for row in result.mappings()]
+        except Exception as e:
+            logger.error(f"业务数据库异步查询失败 [{database_name}]: {sql}, 错误: {e}")
+            raise
+
     def list_databases(self) -> List[str]:
         """
         列出所有已配置的业务数据库
@@ -140,7 +285,6 @@ class BusinessDatabaseManager:
         Returns:
             数据库名称列表
         """
-        self._initialize_databases()
         return list(self._engines.keys())
 
     def database_exists(self, database_name: str) -> bool:
@@ -153,42 +297,41 @@ class BusinessDatabaseManager:
         Returns:
             bool: 数据库是否存在
         """
-        self._initialize_databases()
         return database_name in self._engines
 
+    def _probe(self, database_name: str) -> bool:
+        """对单个数据库执行 SELECT 1 探活"""
+        engine = self._engines.get(database_name)
+        if not engine:
+            return False
+        try:
+            with engine.connect() as conn:
+                conn.execute(_text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.error(f"业务数据库 {database_name} 健康检查失败: {e}")
+            return False
+
     def health_check(self, database_name: Optional[str] = None) -> bool:
         """
         健康检查
 
         Args:
-            database_name: 数据库名称，如果为 None 则检查所有数据库
+            database_name: 数据库名称，如果为 None 则并发检查所有数据库
 
         Returns:
             bool: 连接是否正常
         """
-        self._initialize_databases()
-
         if database_name:
             # 检查指定数据库
-            engine = self._engines.get(database_name)
-            if not engine:
-                return False
-            try:
-                with engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
-                return True
-            except Exception as e:
-                logger.error(f"业务数据库 {database_name} 健康检查失败: {e}")
-                return False
-        else:
-            # 检查所有数据库
-            if not self._engines:
-                return True  # 如果没有配置数据库，认为健康
-            all_healthy = True
-            for db_name in self._engines.keys():
-                if not self.health_check(db_name):
-                    all_healthy = False
-            return all_healthy
+            return self._probe(database_name)
+
+        # 并发检查所有数据库：总耗时从各库延迟之和降为其中最大值
+        if not self._engines:
+            return True  # 如果没有配置数据库，认为健康
+        with ThreadPoolExecutor(max_workers=min(8, len(self._engines))) as pool:
+            results = list(pool.map(self._probe, list(self._engines.keys())))
+        return all(results)
 
     def close_all(self):
         """关闭所有数据库连接"""
@@ -198,7 +341,14 @@ class BusinessDatabaseManager:
                 logger.debug(f"已关闭业务数据库连接: {db_name}")
             except Exception as e:
                 logger.error(f"关闭业务数据库 {db_name} 连接失败: {e}")
+        for db_name, async_engine in self._async_engines.items():
+            try:
+                async_engine.sync_engine.dispose()
+                logger.debug(f"已关闭业务数据库异步连接: {db_name}")
+            except Exception as e:
+                logger.error(f"关闭业务数据库 {db_name} 异步连接失败: {e}")
         self._engines.clear()
+        self._async_engines.clear()
         self._sessions.clear()
         self._initialized = False
 
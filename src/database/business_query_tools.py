@@ -3,14 +3,22 @@ Business Database Query Tools Module
 业务数据库查询工具，提供业务数据库的查询操作方法
 """
 
+import re
+import time
 from typing import List, Dict, Any, Optional
-from sqlalchemy import text, MetaData, Table
+from sqlalchemy import text, inspect, MetaData, Table
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 from .business_db import get_business_db_manager, list_business_databases
 
 logger = logging.getLogger(__name__)
 
+# 表结构缓存TTL（秒）：业务库表结构基本静态，反射结果可以安全复用
+_SCHEMA_CACHE_TTL = 300.0
+
+# 合法表名模式（防止拼接SQL时注入，同时允许编译语句按表名缓存）
+_TABLE_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
 
 class BusinessDatabaseQueryTools:
     """业务数据库查询工具类"""
@@ -24,6 +32,43 @@ class BusinessDatabaseQueryTools:
         """
         self.manager = get_business_db_manager()
         self._default_database = default_database
+        # 首次解析出的默认数据库名（避免每次查询都物化引擎字典的键列表）
+        self._resolved_default: Optional[str] = None
+        # 表结构缓存：{(db_name, table_name): (时间戳, 表信息)} / {(db_name,): (时间戳, 表名列表)}
+        self._schema_cache: Dict[tuple, tuple] = {}
+
+    def _cache_get(self, key: tuple) -> Optional[Any]:
+        """从表结构缓存中获取未过期的条目"""
+        entry = self._schema_cache.get(key)
+        if entry is None:
+            return None
+        ts, value = entry
+        if time.monotonic() - ts > _SCHEMA_CACHE_TTL:
+            del self._schema_cache[key]
+            return None
+        return value
+
+    def _cache_put(self, key: tuple, value: Any):
+        """写入表结构缓存"""
+        self._schema_cache[key] = (time.monotonic(), value)
+
+    def invalidate(self, database_name: Optional[str] = None, table_name: Optional[str] = None):
+        """
+        失效表结构缓存（执行DDL后调用）
+
+        Args:
+            database_name: 数据库名称，如果为None则清空全部缓存
+            table_name: 表名，如果为None则失效该数据库的所有缓存条目
+        """
+        if database_name is None:
+            self._schema_cache.clear()
+            return
+        if table_name is not None:
+            self._schema_cache.pop((database_name, table_name), None)
+            self._schema_cache.pop((database_name,), None)
+        else:
+            for key in [k for k in self._schema_cache if k[0] == database_name]:
+                del self._schema_cache[key]
 
     def _get_database_name(self, database_name: Optional[str] = None) -> str:
         """
@@ -41,11 +86,13 @@ class BusinessDatabaseQueryTools:
         if self._default_database:
             return self._default_database
 
-        # 使用第一个配置的业务数据库
-        databases = list_business_databases()
-        if not databases:
-            raise ValueError("未配置业务数据库（BUSINESS_MYSQL_DATABASES）")
-        return databases[0]
+        # 使用第一个配置的业务数据库（首次解析后缓存）
+        if self._resolved_default is None:
+            databases = list_business_databases()
+            if not databases:
+                raise ValueError("未配置业务数据库（BUSINESS_MYSQL_DATABASES）")
+            self._resolved_default = databases[0]
+        return self._resolved_default
 
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None,
                      database_name: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -66,6 +113,22 @@ class BusinessDatabaseQueryTools:
         db_name = self._get_database_name(database_name)
         return self.manager.execute_query(db_name, query, params)
 
+    async def execute_query_async(self, query: str, params: Optional[Dict[str, Any]] = None,
+                                  database_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        异步执行SQL查询（使用 asyncmy 异步引擎，不阻塞事件循环）
+
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+            database_name: 数据库名称，如果为None则使用默认数据库
+
+        Returns:
+            查询结果列表
+        """
+        db_name = self._get_database_name(database_name)
+        return await self.manager.execute_query_async(db_name, query, params)
+
     def get_table_info(self, table_name: str, database_name: Optional[str] = None) -> Dict[str, Any]:
         """
         获取表信息
@@ -78,6 +141,10 @@ class BusinessDatabaseQueryTools:
             表信息字典
         """
         db_name = self._get_database_name(database_name)
+        cached = self._cache_get((db_name, table_name))
+        if cached is not None:
+            return cached
+
         engine = self.manager.get_engine(db_name)
         if not engine:
             raise ValueError(f"业务数据库 {db_name} 不存在或未配置")
@@ -86,7 +153,7 @@ class BusinessDatabaseQueryTools:
             metadata = MetaData()
             table = Table(table_name, metadata, autoload_with=engine)
 
-            return {
+            table_info = {
                 "name": table.name,
                 "database": db_name,
                 "columns": [
@@ -100,6 +167,8 @@ class BusinessDatabaseQueryTools:
                 ],
                 "primary_keys": [col.name for col in table.primary_key.columns],
             }
+            self._cache_put((db_name, table_name), table_info)
+            return table_info
 
         except SQLAlchemyError as e:
             logger.error(f"获取表信息失败: {table_name}, 数据库: {db_name}, 错误: {e}")
@@ -116,14 +185,20 @@ class BusinessDatabaseQueryTools:
             表名列表
         """
         db_name = self._get_database_name(database_name)
+        cached = self._cache_get((db_name,))
+        if cached is not None:
+            return cached
+
         engine = self.manager.get_engine(db_name)
         if not engine:
             raise ValueError(f"业务数据库 {db_name} 不存在或未配置")
 
         try:
-            metadata = MetaData()
-            metadata.reflect(bind=engine)
-            return list(metadata.tables.keys())
+            # 只需要表名，使用 inspect 发起单次 SHOW TABLES 查询，
+            # 避免 metadata.reflect 把所有表的完整列定义都拉回来
+            tables = inspect(engine).get_table_names()
+            self._cache_put((db_name,), tables)
+            return tables
 
         except SQLAlchemyError as e:
             logger.error(f"列出表失败，数据库: {db_name}, 错误: {e}")
@@ -140,6 +215,9 @@ class BusinessDatabaseQueryTools:
         Returns:
             记录数
         """
+        if not _TABLE_NAME_RE.fullmatch(table_name):
+            raise ValueError(f"非法表名: {table_name}")
+        # 固定形态的SQL，编译结果由 business_db._text 按语句字符串缓存
         query = f"SELECT COUNT(*) as count FROM {table_name}"
         result = self.execute_query(query, database_name=database_name)
         return result[0]["count"] if result else 0
@@ -3,42 +3,181 @@ MySQL Database Connection Module
 使用 agno.db.mysql.MySQLDb 进行数据库连接管理
 """
 
+import functools
+import hashlib
 import os
+import tempfile
+import threading
+from types import SimpleNamespace
 from typing import Optional, Any
+import pymysql
 from sqlalchemy import create_engine, text
+from sqlalchemy.orm import scoped_session, sessionmaker
 from agno.db.mysql import MySQLDb
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 已确保存在的数据库schema：workflow/team/agent 三个连接共用同一个
+# schema，DDL 只需要执行一次
+_schemas_ensured: set = set()
+
+
+def _schema_marker_path(schema: str, table_ddls: tuple, cfg: SimpleNamespace) -> str:
+    """返回schema引导结果的标记文件路径（按连接目标+内容哈希区分）
+
+    哈希键包含 host/port/user：标记只对当初执行过DDL的那台服务器
+    有效，换库（改 MYSQL_HOST 等）后不会误判为已引导而跳过建库建表。
+    """
+    key = "\n".join((f"{cfg.host}:{cfg.port}:{cfg.user}", schema) + table_ddls)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f".agno_schema_{digest}")
+
+
+def ensure_schema_and_tables(schema: str, table_ddls: Optional[list] = None):
+    """
+    一次往返内完成数据库schema与表的幂等引导
+
+    单个启用多语句的 pymysql 连接依次执行 CREATE DATABASE IF NOT
+    EXISTS、USE 和全部 CREATE TABLE IF NOT EXISTS 语句。成功后在临时
+    目录写入按内容哈希命名的标记文件，热重启的进程直接跳过DDL。
+
+    Args:
+        schema: 数据库名
+        table_ddls: CREATE TABLE IF NOT EXISTS 语句列表（可为空）
+    """
+    ddls = tuple(table_ddls or ())
+    if schema in _schemas_ensured:
+        return
+
+    cfg = _load_db_config()
+    marker = _schema_marker_path(schema, ddls, cfg)
+    if os.path.exists(marker):
+        _schemas_ensured.add(schema)
+        logger.debug(f"数据库 '{schema}' 引导标记已存在，跳过DDL")
+        return
+
+    server_conn = pymysql.connect(
+        host=cfg.host, port=cfg.port,
+        user=cfg.user, password=cfg.password,
+        autocommit=True,
+        client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS,
+    )
+    try:
+        with server_conn.cursor() as cursor:
+            statements = [
+                f"CREATE DATABASE IF NOT EXISTS `{schema}` "
+                f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci",
+            ]
+            if ddls:
+                statements.append(f"USE `{schema}`")
+                statements.extend(ddls)
+            cursor.execute("; ".join(statements))
+            # 消费多语句的全部结果集
+            while cursor.nextset():
+                pass
+    finally:
+        server_conn.close()
+
+    _schemas_ensured.add(schema)
+    try:
+        with open(marker, "w"):
+            pass
+    except OSError:
+        # 标记文件只是热启动优化，写入失败不影响功能
+        pass
+    logger.debug(f"数据库 '{schema}' 已确保存在（如不存在则已创建）")
+
+
+@functools.lru_cache(maxsize=1)
+def _load_db_config() -> SimpleNamespace:
+    """
+    一次性读取Agno数据库相关的环境变量并冻结为配置对象
+
+    连接构造路径上原本要做十几次 os.getenv 查找；首次调用后
+    后续全部命中 lru_cache，只剩一次属性访问。
+    """
+    return SimpleNamespace(
+        host=os.getenv("AGNO_MYSQL_HOST", os.getenv("MYSQL_HOST", "localhost")),
+        port=int(os.getenv("AGNO_MYSQL_PORT", os.getenv("MYSQL_PORT", "3306"))),
+        user=os.getenv("AGNO_MYSQL_USER", os.getenv("MYSQL_USER", "root")),
+        password=os.getenv("AGNO_MYSQL_PASSWORD", os.getenv("MYSQL_PASSWORD", "password")),
+        db_schema=os.getenv("AGNO_MYSQL_DB_SCHEMA", os.getenv("AGNO_MYSQL_DATABASE", os.getenv("MYSQL_DATABASE", "agno_backend"))),
+        memory_table=os.getenv("AGNO_MEMORY_TABLE", "agno_tags_memories"),
+        traces_table=os.getenv("AGNO_TRACES_TABLE", "agno_tags_traces"),
+        spans_table=os.getenv("AGNO_SPANS_TABLE", "agno_tags_spans"),
+        metrics_table=os.getenv("AGNO_METRICS_TABLE", "agno_tags_metrics"),
+        eval_table=os.getenv("AGNO_EVAL_TABLE", "agno_tags_evaluations"),
+        knowledge_table=os.getenv("AGNO_KNOWLEDGE_TABLE", "agno_tags_knowledge"),
+        culture_table=os.getenv("AGNO_CULTURE_TABLE", "agno_tags_culture"),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_shared_engine():
+    """
+    获取共享的SQLAlchemy引擎（带连接池配置）
+
+    workflow/team/agent 三个连接指向同一个MySQL schema，只是会话表
+    不同；共用一个引擎让它们共享一个连接池，空闲连接数和冷启动
+    成本都降为原来的三分之一。
+    """
+    cfg = _load_db_config()
+    db_url = f"mysql+pymysql://{cfg.user}:{cfg.password}@{cfg.host}:{cfg.port}"
+    return create_engine(
+        db_url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_pre_ping=True,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session_factory() -> scoped_session:
+    """
+    获取基于共享引擎的线程级会话工厂
+
+    SQLAlchemy 的 Session 不是线程安全的；scoped_session 按当前线程
+    分发独立的 Session，既允许真正的并发使用，也避免单个长寿命
+    Session 的身份映射无限增长。
+    """
+    return scoped_session(
+        sessionmaker(bind=_get_shared_engine(), expire_on_commit=False)
+    )
+
 
 class DatabaseConnection:
     """MySQL数据库连接管理类"""
 
+    # 固定属性集合：省掉每实例的 __dict__，属性访问也更快
+    __slots__ = ('_db', '_session_table', '_init_lock')
+
     def __init__(self, session_table: str = "agno_tags_sessions"):
         """
         初始化数据库连接
-        
+
         Args:
             session_table: 会话表名
         """
         self._db: Optional[MySQLDb] = None
-        self._session: Optional[Any] = None
         self._session_table = session_table
+        self._init_lock = threading.Lock()
 
     @property
     def db(self) -> MySQLDb:
-        """获取数据库实例"""
+        """获取数据库实例（双重检查锁，快路径无锁）"""
         if self._db is None:
-            self._db = self._create_database_connection()
+            with self._init_lock:
+                if self._db is None:
+                    self._db = self._create_database_connection()
         return self._db
 
     @property
     def session(self) -> Any:
-        """获取数据库会话"""
-        if self._session is None:
-            self._session = self.db.Session()
-        return self._session
+        """获取当前线程的数据库会话（scoped_session 按线程分发）"""
+        return _get_session_factory()()
 
     def _create_database_connection(self) -> MySQLDb:
         """
@@ -49,54 +188,31 @@ class DatabaseConnection:
             MySQLDb: 配置好的数据库连接实例
         """
         try:
-            # 从环境变量获取Agno专用数据库配置
-            host = os.getenv("AGNO_MYSQL_HOST", os.getenv("MYSQL_HOST", "localhost"))
-            port = int(os.getenv("AGNO_MYSQL_PORT", os.getenv("MYSQL_PORT", "3306")))
-            user = os.getenv("AGNO_MYSQL_USER", os.getenv("MYSQL_USER", "root"))
-            password = os.getenv("AGNO_MYSQL_PASSWORD", os.getenv("MYSQL_PASSWORD", "password"))
-            db_schema = os.getenv("AGNO_MYSQL_DB_SCHEMA", os.getenv("AGNO_MYSQL_DATABASE", os.getenv("MYSQL_DATABASE", "agno_backend")))
-
-            # 先连接到MySQL服务器（不指定数据库）以创建数据库
-            # 构建不带数据库名的连接URL
-            server_url = f"mysql+pymysql://{user}:{password}@{host}:{port}"
-            server_engine = create_engine(server_url)
-            
-            # 检查数据库是否存在，如果不存在则创建
-            with server_engine.connect() as conn:
-                # MySQL创建数据库的SQL语句（如果不存在）
-                create_db_sql = text(f"CREATE DATABASE IF NOT EXISTS `{db_schema}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-                conn.execute(create_db_sql)
-                conn.commit()
-                logger.debug(f"数据库 '{db_schema}' 已确保存在（如不存在则已创建）")
-            
-            server_engine.dispose()
-
-            # 构建数据库URL（用于MySQLDb）
-            db_url = f"mysql+pymysql://{user}:{password}@{host}:{port}"
-
-            # 从环境变量获取表名配置（带默认值）
-            memory_table = os.getenv("AGNO_MEMORY_TABLE", "agno_tags_memories")
-            traces_table = os.getenv("AGNO_TRACES_TABLE", "agno_tags_traces")
-            spans_table = os.getenv("AGNO_SPANS_TABLE", "agno_tags_spans")
-            metrics_table = os.getenv("AGNO_METRICS_TABLE", "agno_tags_metrics")
-            eval_table = os.getenv("AGNO_EVAL_TABLE", "agno_tags_evaluations")
-            knowledge_table = os.getenv("AGNO_KNOWLEDGE_TABLE", "agno_tags_knowledge")
-            culture_table = os.getenv("AGNO_CULTURE_TABLE", "agno_tags_culture")
+            # Agno专用数据库配置（环境变量只读一次，见 _load_db_config）
+            cfg = _load_db_config()
+            db_schema = cfg.db_schema
+
+            # 确保数据库存在：单次往返的幂等引导，热重启直接跳过
+            ensure_schema_and_tables(db_schema)
+
+            # 共享引擎（带连接池配置）：三类连接共用一个连接池，
+            # 热路径上的查询只需从暖池中廉价地取出连接
+            engine = _get_shared_engine()
 
             # 创建MySQL数据库连接（推荐方式）
             # 注意：MySQLDb 在首次使用时可能会自动创建表，但我们先不执行任何操作
             db = MySQLDb(
-                db_url=db_url,  # 数据库连接（不包含数据库名）
+                db_engine=engine,  # 预构建的引擎（带连接池配置）
                 db_schema=db_schema,  # 数据库名
                 # 自定义表名（从环境变量读取，带默认值）
                 session_table=self._session_table,  # 会话表名（从配置或参数获取）
-                memory_table=memory_table,  # 记忆表名
-                traces_table=traces_table,    # 追踪表名
-                spans_table=spans_table,      # Span表名
-                metrics_table=metrics_table,  # 指标表名
-                eval_table=eval_table, # 评估表名
-                knowledge_table=knowledge_table,  # 知识表名
-                culture_table=culture_table,   # 文化知识表名
+                memory_table=cfg.memory_table,  # 记忆表名
+                traces_table=cfg.traces_table,    # 追踪表名
+                spans_table=cfg.spans_table,      # Span表名
+                metrics_table=cfg.metrics_table,  # 指标表名
+                eval_table=cfg.eval_table, # 评估表名
+                knowledge_table=cfg.knowledge_table,  # 知识表名
+                culture_table=cfg.culture_table,   # 文化知识表名
             )
 
             logger.debug(f"成功连接到MySQL数据库: {db_schema}")
@@ -108,10 +224,8 @@ class DatabaseConnection:
 
     def close(self):
         """关闭数据库连接"""
-        if self._session:
-            self._session.close()
-            self._session = None
-        # MySQLDb 的连接由 SQLAlchemy 管理，通常不需要显式关闭
+        # 释放当前线程持有的会话；连接本身由共享引擎的连接池管理
+        _get_session_factory().remove()
 
 
 # 全局数据库连接实例（按类型分别创建）
@@ -119,10 +233,14 @@ _workflow_db_connection: Optional[DatabaseConnection] = None
 _team_db_connection: Optional[DatabaseConnection] = None
 _agent_db_connection: Optional[DatabaseConnection] = None
 
+# 单例初始化锁：防止多线程冷启动时重复创建引擎和连接池
+_init_lock = threading.Lock()
+
 
+@functools.lru_cache(maxsize=None)
 def _get_session_table_name(table_type: str) -> str:
     """
-    从环境变量获取会话表名
+    从环境变量获取会话表名（每种类型只读一次环境变量）
     
     Args:
         table_type: 表类型 ('workflow', 'team', 'agent')
@@ -150,8 +268,10 @@ def get_workflow_database() -> MySQLDb:
     """
     global _workflow_db_connection
     if _workflow_db_connection is None:
-        session_table = _get_session_table_name('workflow')
-        _workflow_db_connection = DatabaseConnection(session_table=session_table)
+        with _init_lock:
+            if _workflow_db_connection is None:
+                session_table = _get_session_table_name('workflow')
+                _workflow_db_connection = DatabaseConnection(session_table=session_table)
     return _workflow_db_connection.db
 
 
@@ -164,8 +284,10 @@ def get_team_database() -> MySQLDb:
     """
     global _team_db_connection
     if _team_db_connection is None:
-        session_table = _get_session_table_name('team')
-        _team_db_connection = DatabaseConnection(session_table=session_table)
+        with _init_lock:
+            if _team_db_connection is None:
+                session_table = _get_session_table_name('team')
+                _team_db_connection = DatabaseConnection(session_table=session_table)
     return _team_db_connection.db
 
 
@@ -178,8 +300,10 @@ def get_agent_database() -> MySQLDb:
     """
     global _agent_db_connection
     if _agent_db_connection is None:
-        session_table = _get_session_table_name('agent')
-        _agent_db_connection = DatabaseConnection(session_table=session_table)
+        with _init_lock:
+            if _agent_db_connection is None:
+                session_table = _get_session_table_name('agent')
+                _agent_db_connection = DatabaseConnection(session_table=session_table)
     return _agent_db_connection.db
 
 
@@ -203,19 +327,37 @@ def get_db_session() -> Any:
     """
     global _agent_db_connection
     if _agent_db_connection is None:
-        session_table = _get_session_table_name('agent')
-        _agent_db_connection = DatabaseConnection(session_table=session_table)
+        with _init_lock:
+            if _agent_db_connection is None:
+                session_table = _get_session_table_name('agent')
+                _agent_db_connection = DatabaseConnection(session_table=session_table)
     return _agent_db_connection.session
 
 
+def remove_session():
+    """
+    释放当前线程的数据库会话（请求结束时调用）
+
+    scoped_session 按线程缓存 Session；在请求/任务收尾处调用本函数
+    归还连接并清空身份映射，防止跨请求状态泄漏。
+    """
+    _get_session_factory().remove()
+
+
 def check_database_connection() -> bool:
     """
-    检查数据库连接状态（已禁用健康检查）
+    检查数据库连接状态（对Agent数据库执行 SELECT 1 探活）
 
     Returns:
-        bool: 始终返回 True
+        bool: 连接是否正常
     """
-    return True
+    try:
+        with get_agent_database().engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error(f"数据库连接检查失败: {e}")
+        return False
 
 
 def close_database_connection():
@@ -3,20 +3,120 @@ Database Query Tools Module
 数据库查询工具，提供常用的数据库操作方法
 """
 
+import functools
+import re
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional, Union
 from sqlalchemy import text, MetaData, Table, Column, String, Integer, DateTime, Text, Boolean
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import threading
+import time
 from .connection import get_database, get_db_session
 
 logger = logging.getLogger(__name__)
 
+# 表结构缓存TTL（秒）：表结构很少变化，反射结果在TTL内直接复用，
+# 省掉每次调用对 INFORMATION_SCHEMA 的多次往返
+_TABLE_INFO_TTL = 300.0
+
+# text() 需要解析 :param 占位符，按语句字符串缓存解析结果，
+# 热循环中重复执行同一语句时直接复用 TextClause
+_text = functools.lru_cache(maxsize=1024)(text)
+
+# 合法标识符模式：拼接进SQL的表名/列名必须匹配，防止注入；
+# 同时保证相同条件集合生成完全一致的语句字符串，命中 _text 缓存
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _check_identifier(name: str) -> str:
+    """校验表名/列名为合法标识符，非法时抛出 ValueError"""
+    if not _IDENTIFIER_RE.fullmatch(name):
+        raise ValueError(f"非法标识符: {name}")
+    return name
+
+
+@functools.lru_cache(maxsize=1024)
+def _sql_template(op: str, table_name: str, keys: tuple,
+                  has_limit: bool = False, has_offset: bool = False) -> str:
+    """
+    生成并缓存CRUD语句模板
+
+    按 (操作, 表名, 键元组) 缓存拼接结果，热路径上的CRUD调用
+    不再重复做标识符校验和字符串拼接，只剩一次缓存查找。
+
+    Args:
+        op: 操作类型（'insert'/'update'/'delete'/'search'）
+        table_name: 表名
+        keys: 列名元组（update时为 (data键元组, conditions键元组)）
+        has_limit: search时是否带LIMIT
+        has_offset: search时是否带OFFSET
+
+    Returns:
+        SQL语句模板字符串
+    """
+    _check_identifier(table_name)
+    if op == 'insert':
+        columns = ", ".join(_check_identifier(key) for key in keys)
+        placeholders = ", ".join(f":{key}" for key in keys)
+        return f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+
+    if op == 'update':
+        data_keys, cond_keys = keys
+        set_clause = ", ".join(f"{_check_identifier(k)} = :set_{k}" for k in data_keys)
+        where_clause = " AND ".join(f"{_check_identifier(k)} = :where_{k}" for k in cond_keys) or "1=1"
+        return f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+
+    where_clause = " AND ".join(f"{_check_identifier(k)} = :{k}" for k in keys) or "1=1"
+    if op == 'delete':
+        return f"DELETE FROM {table_name} WHERE {where_clause}"
+
+    # search
+    query = f"SELECT * FROM {table_name} WHERE {where_clause}"
+    # LIMIT/OFFSET 走绑定参数：不同分页取值复用同一条语句，
+    # 命中 _text 缓存和 MySQL 侧的语句缓存
+    if has_limit:
+        query += " LIMIT :_limit"
+    if has_offset:
+        query += " OFFSET :_offset"
+    return query
+
+
+class _BulkContext:
+    """批量执行上下文：单连接、单事务内重复执行语句"""
+
+    __slots__ = ('_conn',)
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, query: str, params: Union[Dict[str, Any], List[Dict[str, Any]], None] = None) -> int:
+        """
+        在共享事务内执行语句
+
+        params 为列表时走 SQLAlchemy 的 executemany 快路径。
+
+        Args:
+            query: SQL语句
+            params: 单组参数或参数列表
+
+        Returns:
+            影响的行数
+        """
+        result = self._conn.execute(_text(query), params or {})
+        return result.rowcount
+
 
 class DatabaseQueryTools:
     """数据库查询工具类"""
 
+    # 固定属性集合：省掉每实例的 __dict__，属性访问也更快
+    __slots__ = ('_db', '_table_cache')
+
     def __init__(self):
         self._db = None
+        # 反射结果缓存：{表名: (时间戳, 表信息)}；表名列表用 None 作键
+        self._table_cache: Dict[Optional[str], tuple] = {}
     
     @property
     def db(self):
@@ -41,20 +141,42 @@ class DatabaseQueryTools:
         """
         try:
             with self.db.engine.connect() as conn:
-                if params:
-                    result = conn.execute(text(query), params)
-                else:
-                    result = conn.execute(text(query))
+                result = conn.execute(_text(query), params or {})
 
-                # 获取列名
-                columns = result.keys()
-                # 返回字典列表
-                return [dict(zip(columns, row)) for row in result.fetchall()]
+                # mappings() 走 SQLAlchemy 的 C 行实现，
+                # 比手工 dict(zip(columns, row)) 少两次 Python 层遍历
+                return [dict(row) for row in result.mappings()]
 
         except SQLAlchemyError as e:
             logger.error(f"查询执行失败: {query}, 错误: {e}")
             raise
 
+    def stream_query(self, query: str, params: Optional[Dict[str, Any]] = None, chunk: int = 1000):
+        """
+        流式执行SQL查询，逐行产出结果
+
+        服务端游标按 chunk 大小分批取回，内存占用为 O(chunk) 而不是 O(行数)。
+
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+            chunk: 每批取回的行数
+
+        Yields:
+            逐行的结果字典
+        """
+        try:
+            with self.db.engine.connect() as conn:
+                result = conn.execution_options(
+                    stream_results=True, yield_per=chunk
+                ).execute(_text(query), params or {})
+                for row in result.mappings():
+                    yield dict(row)
+
+        except SQLAlchemyError as e:
+            logger.error(f"流式查询执行失败: {query}, 错误: {e}")
+            raise
+
     def execute_update(self, query: str, params: Optional[Dict[str, Any]] = None) -> int:
         """
         执行更新操作（INSERT、UPDATE、DELETE）
@@ -72,19 +194,91 @@ class DatabaseQueryTools:
         try:
             with self.db.engine.connect() as conn:
                 with conn.begin():
-                    if params:
-                        result = conn.execute(text(query), params)
-                    else:
-                        result = conn.execute(text(query))
+                    result = conn.execute(_text(query), params or {})
                     return result.rowcount
 
         except SQLAlchemyError as e:
             logger.error(f"更新操作失败: {query}, 错误: {e}")
             raise
 
+    @contextmanager
+    def bulk(self):
+        """
+        批量执行上下文管理器
+
+        打开一个连接和一个事务，供循环调用方重复执行语句，省掉
+        每条语句一对 BEGIN/COMMIT 和连接取还的开销::
+
+            with query_tools.bulk() as b:
+                b.execute("UPDATE ... WHERE id = :id", [{"id": 1}, {"id": 2}])
+
+        Yields:
+            _BulkContext: 暴露 execute(query, params) 的执行上下文
+        """
+        try:
+            with self.db.engine.connect() as conn:
+                with conn.begin():
+                    yield _BulkContext(conn)
+
+        except SQLAlchemyError as e:
+            logger.error(f"批量执行失败: {e}")
+            raise
+
+    def execute_insert(self, query: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """
+        执行插入操作并返回自增主键ID
+
+        在同一次 execute 上读取 cursor.lastrowid，不再发起第二次
+        SELECT LAST_INSERT_ID() 往返（连接池下两次查询可能落在不同
+        连接上，返回错误的ID）。
+
+        Args:
+            query: INSERT语句
+            params: 参数
+
+        Returns:
+            插入的记录ID（如果有自增主键）
+
+        Raises:
+            SQLAlchemyError: 执行失败
+        """
+        try:
+            with self.db.engine.connect() as conn:
+                with conn.begin():
+                    result = conn.execute(_text(query), params or {})
+                    return result.lastrowid or 0
+
+        except SQLAlchemyError as e:
+            logger.error(f"插入操作失败: {query}, 错误: {e}")
+            raise
+
+    def _cache_get(self, key: Optional[str]):
+        """读取未过期的反射缓存条目"""
+        entry = self._table_cache.get(key)
+        if entry is None:
+            return None
+        ts, value = entry
+        if time.monotonic() - ts > _TABLE_INFO_TTL:
+            del self._table_cache[key]
+            return None
+        return value
+
+    def invalidate_table_cache(self, table_name: Optional[str] = None):
+        """
+        失效反射缓存（执行DDL后调用）
+
+        Args:
+            table_name: 表名，如果为None则清空全部缓存
+        """
+        if table_name is None:
+            self._table_cache.clear()
+        else:
+            self._table_cache.pop(table_name, None)
+            self._table_cache.pop(None, None)
+
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """
-        获取表信息
+        获取表信息（带TTL缓存）
 
         Args:
             table_name: 表名
@@ -92,11 +286,15 @@ class DatabaseQueryTools:
         Returns:
             表信息字典
         """
+        cached = self._cache_get(table_name)
+        if cached is not None:
+            return cached
+
         try:
             metadata = MetaData()
             table = Table(table_name, metadata, autoload_with=self.db.engine)
 
-            return {
+            table_info = {
                 "name": table.name,
                 "columns": [
                     {
@@ -109,6 +307,8 @@ class DatabaseQueryTools:
                 ],
                 "primary_keys": [col.name for col in table.primary_key.columns],
             }
+            self._table_cache[table_name] = (time.monotonic(), table_info)
+            return table_info
 
         except SQLAlchemyError as e:
             logger.error(f"获取表信息失败: {table_name}, 错误: {e}")
@@ -116,15 +316,21 @@ class DatabaseQueryTools:
 
     def list_tables(self) -> List[str]:
         """
-        列出数据库中的所有表
+        列出数据库中的所有表（带TTL缓存）
 
         Returns:
             表名列表
         """
+        cached = self._cache_get(None)
+        if cached is not None:
+            return cached
+
         try:
             metadata = MetaData()
             metadata.reflect(bind=self.db.engine)
-            return list(metadata.tables.keys())
+            tables = list(metadata.tables.keys())
+            self._table_cache[None] = (time.monotonic(), tables)
+            return tables
 
         except SQLAlchemyError as e:
             logger.error(f"列出表失败: {e}")
@@ -140,6 +346,7 @@ class DatabaseQueryTools:
         Returns:
             记录数
         """
+        _check_identifier(table_name)
         query = f"SELECT COUNT(*) as count FROM {table_name}"
         result = self.execute_query(query)
         return result[0]["count"] if result else 0
@@ -158,21 +365,13 @@ class DatabaseQueryTools:
         Returns:
             查询结果
         """
-        where_clauses = []
-        params = {}
-
-        for key, value in conditions.items():
-            where_clauses.append(f"{key} = :{key}")
-            params[key] = value
-
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-        query = f"SELECT * FROM {table_name} WHERE {where_clause}"
-
+        params = dict(conditions)
+        query = _sql_template('search', table_name, tuple(conditions),
+                              has_limit=bool(limit), has_offset=bool(offset))
         if limit:
-            query += f" LIMIT {limit}"
+            params["_limit"] = limit
         if offset:
-            query += f" OFFSET {offset}"
+            params["_offset"] = offset
 
         return self.execute_query(query, params)
 
@@ -187,17 +386,65 @@ class DatabaseQueryTools:
         Returns:
             插入的记录ID（如果有自增主键）
         """
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(f":{key}" for key in data.keys())
+        query = _sql_template('insert', table_name, tuple(data))
 
-        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        # 执行插入并在同一连接上取回自增ID
+        return self.execute_insert(query, data)
 
-        # 执行插入
-        self.execute_update(query, data)
+    def insert_many(self, table_name: str, rows: List[Dict[str, Any]],
+                    chunk_size: int = 500) -> int:
+        """
+        批量插入记录
 
-        # 获取最后插入的ID（适用于自增主键）
-        result = self.execute_query("SELECT LAST_INSERT_ID() as id")
-        return result[0]["id"] if result else 0
+        每个分片构造一条多行 VALUES 的 INSERT，在单个事务内执行，
+        N 条记录的网络往返从 N 次降为 O(N/chunk_size) 次。
+
+        Args:
+            table_name: 表名
+            rows: 要插入的记录列表（各行键集合必须一致）
+            chunk_size: 每条INSERT语句包含的行数
+
+        Returns:
+            插入的总行数
+
+        Raises:
+            ValueError: 各行键集合不一致
+            SQLAlchemyError: 执行失败
+        """
+        if not rows:
+            return 0
+
+        _check_identifier(table_name)
+        keys = [_check_identifier(key) for key in rows[0].keys()]
+        key_set = set(keys)
+        for row in rows:
+            if set(row.keys()) != key_set:
+                raise ValueError("批量插入的各行必须具有相同的键集合")
+
+        columns = ", ".join(keys)
+        total = 0
+        try:
+            with self.db.engine.connect() as conn:
+                with conn.begin():
+                    for start in range(0, len(rows), chunk_size):
+                        chunk = rows[start:start + chunk_size]
+                        values_sql = ", ".join(
+                            "(" + ", ".join(f":v{i}_{key}" for key in keys) + ")"
+                            for i in range(len(chunk))
+                        )
+                        params = {
+                            f"v{i}_{key}": row[key]
+                            for i, row in enumerate(chunk)
+                            for key in keys
+                        }
+                        query = f"INSERT INTO {table_name} ({columns}) VALUES {values_sql}"
+                        result = conn.execute(_text(query), params)
+                        total += result.rowcount
+            return total
+
+        except SQLAlchemyError as e:
+            logger.error(f"批量插入失败: {table_name}, 错误: {e}")
+            raise
 
     def update_record(self, table_name: str, data: Dict[str, Any],
                      conditions: Dict[str, Any]) -> int:
@@ -212,24 +459,12 @@ class DatabaseQueryTools:
         Returns:
             影响的行数
         """
-        set_clauses = []
-        where_clauses = []
-        params = {}
-
-        # 构建SET子句
-        for key, value in data.items():
-            set_clauses.append(f"{key} = :set_{key}")
-            params[f"set_{key}"] = value
-
-        # 构建WHERE子句
-        for key, value in conditions.items():
-            where_clauses.append(f"{key} = :where_{key}")
-            params[f"where_{key}"] = value
-
-        set_clause = ", ".join(set_clauses)
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-        query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+        query = _sql_template('update', table_name, (tuple(data), tuple(conditions)))
+        # 两个字典推导一次合并，单遍构建参数
+        params = {
+            **{f"set_{k}": v for k, v in data.items()},
+            **{f"where_{k}": v for k, v in conditions.items()},
+        }
 
         return self.execute_update(query, params)
 
@@ -244,26 +479,21 @@ class DatabaseQueryTools:
         Returns:
             删除的行数
         """
-        where_clauses = []
-        params = {}
-
-        for key, value in conditions.items():
-            where_clauses.append(f"{key} = :{key}")
-            params[key] = value
+        query = _sql_template('delete', table_name, tuple(conditions))
 
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-        query = f"DELETE FROM {table_name} WHERE {where_clause}"
-
-        return self.execute_update(query, params)
+        return self.execute_update(query, dict(conditions))
 
 
-# 全局查询工具实例（延迟初始化）
+# 全局查询工具实例（延迟初始化，双重检查锁保证只创建一次）
 _query_tools: Optional[DatabaseQueryTools] = None
+_init_lock = threading.Lock()
 
 
 def get_query_tools() -> DatabaseQueryTools:
     """获取查询工具实例（延迟初始化）"""
     global _query_tools
     if _query_tools is None:
-        _query_tools = DatabaseQueryTools()
+        with _init_lock:
+            if _query_tools is None:
+                _query_tools = DatabaseQueryTools()
     return _query_tools
@@ -3,6 +3,8 @@ DB Agent Module
 数据库查询智能体定义
 """
 
+import functools
+
 from agno.agent import Agent
 from src.models.model_config import get_chat_model
 from src.database.connection import get_agent_database
@@ -11,31 +13,8 @@ from src.engine.tools.vector_tools import vector_tools_list
 from src.knowledge import create_knowledge
 
 
-def create_db_agent() -> Agent:
-    """
-    创建数据库查询智能体
-    
-    定位：当启用时，应调用数据库工具进行数据库信息查询，返回查询到的结果。
-    
-    注意：
-    - Agent使用Agno专用数据库存储会话和记忆
-    - 查询工具使用业务数据库进行数据查询
-    - 配置了知识库（Milvus向量数据库 + MySQL内容数据库）
-    
-    Returns:
-        Agent: 数据库查询智能体实例
-    """
-    chat_model = get_chat_model()
-    
-    # 创建知识库实例（Milvus向量数据库 + MySQL内容数据库）
-    knowledge = create_knowledge()
-    
-    agent = Agent(
-        name="DB Agent",
-        model=chat_model,
-        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
-        knowledge=knowledge,  # 配置知识库
-        instructions="""你是一个数据库和知识库查询助手。
+# 指令文本常量：模块加载时构建一次，不随每次工厂调用重建
+_DB_INSTRUCTIONS = """你是一个数据库和知识库查询助手。
     当启用时，应调用相应工具进行数据库或知识库信息查询，返回查询到的结果。
     
     当前可用的工具分为两类：
@@ -60,7 +39,35 @@ def create_db_agent() -> Agent:
     - 业务数据库工具连接的是MySQL业务数据库，用于查询业务数据。所有数据库共享相同的连接配置（HOST、PORT、USER、PASSWORD），仅数据库名称不同。
     - 知识库工具连接的是Milvus向量数据库，用于查询向量化的知识数据。
     - 知识库连接时会自动创建默认集合 agno_knowledge_default（如果不存在）。
-    - 知识库已配置，支持向量搜索和内容存储功能。""",
+    - 知识库已配置，支持向量搜索和内容存储功能。"""
+
+
+@functools.lru_cache(maxsize=1)
+def create_db_agent() -> Agent:
+    """
+    创建数据库查询智能体
+    
+    定位：当启用时，应调用数据库工具进行数据库信息查询，返回查询到的结果。
+    
+    注意：
+    - Agent使用Agno专用数据库存储会话和记忆
+    - 查询工具使用业务数据库进行数据查询
+    - 配置了知识库（Milvus向量数据库 + MySQL内容数据库）
+    
+    Returns:
+        Agent: 数据库查询智能体实例
+    """
+    chat_model = get_chat_model()
+    
+    # 创建知识库实例（Milvus向量数据库 + MySQL内容数据库）
+    knowledge = create_knowledge()
+    
+    agent = Agent(
+        name="DB Agent",
+        model=chat_model,
+        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
+        knowledge=knowledge,  # 配置知识库
+        instructions=_DB_INSTRUCTIONS,
         tools=database_tools + vector_tools_list,  # 工具包含业务数据库和知识库查询工具
         add_history_to_context=True,
         enable_agentic_memory=True,
@@ -3,29 +3,24 @@ Intent Agent Module
 意图识别与任务规划智能体定义
 """
 
+import functools
+
 from agno.agent import Agent
+from pydantic import BaseModel
 from src.models.model_config import get_chat_model
 from src.database.connection import get_agent_database
 
 
-def create_intent_agent() -> Agent:
-    """
-    创建意图识别与任务规划智能体
-    
-    定位：
-    - 输入：用户的提问
-    - 输出：激活启用的agent列表（是否启用db_agent，输出agent始终都要启用）以及一段对用户意图的简单判断的信息
-    
-    Returns:
-        Agent: 意图识别智能体实例
-    """
-    chat_model = get_chat_model()
-    
-    agent = Agent(
-        name="Intent Agent",
-        model=chat_model,
-        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
-        instructions="""你是一个意图识别与任务规划助手。
+class IntentResult(BaseModel):
+    """意图识别结构化输出"""
+    enable_db_agent: bool = False
+    enable_discussion_team: bool = False
+    discussion_needs_db: bool = True
+    intent_summary: str = "未识别到明确意图"
+
+
+# 指令文本常量：模块加载时构建一次，不随每次工厂调用重建
+_INTENT_INSTRUCTIONS = """你是一个意图识别与任务规划助手。
     
     你的任务是分析用户的提问，识别用户意图，并规划需要激活的智能体。
     
@@ -78,7 +73,31 @@ def create_intent_agent() -> Agent:
         "intent_summary": "用户需要多角度分析远程办公问题，需要启用讨论团队"
     }
     
-    请严格按照JSON格式输出，不要添加任何其他文字说明。""",
+    请严格按照JSON格式输出，不要添加任何其他文字说明。"""
+
+
+@functools.lru_cache(maxsize=1)
+def create_intent_agent() -> Agent:
+    """
+    创建意图识别与任务规划智能体
+    
+    定位：
+    - 输入：用户的提问
+    - 输出：激活启用的agent列表（是否启用db_agent，输出agent始终都要启用）以及一段对用户意图的简单判断的信息
+    
+    Returns:
+        Agent: 意图识别智能体实例
+    """
+    chat_model = get_chat_model()
+    
+    agent = Agent(
+        name="Intent Agent",
+        model=chat_model,
+        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
+        instructions=_INTENT_INSTRUCTIONS,
+        # 结构化输出：模型经由 JSON/函数调用模式直接产出 IntentResult，
+        # 下游无需再从自由文本中抓取JSON
+        output_schema=IntentResult,
         add_history_to_context=True,
         enable_agentic_memory=True,
     )
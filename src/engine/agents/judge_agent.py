@@ -3,6 +3,7 @@ Judge Agent Module
 评判智能体定义 - 评估Team讨论输出质量
 """
 
+import functools
 import os
 import logging
 from agno.eval.agent_as_judge import AgentAsJudgeEval
@@ -11,7 +12,17 @@ from src.database.connection import get_team_database
 
 logger = logging.getLogger(__name__)
 
+# 默认评估标准：模块加载时构建一次，不随每次工厂调用重建
+_DEFAULT_CRITERIA = """讨论结果应该具备以下特点：
+1. 观点清晰明确，逻辑严谨
+2. 论证充分，有有力的证据和理论支持
+3. 考虑了多角度和多方面的因素
+4. 讨论深入，体现了正反方的充分辩论
+5. 结论合理，有建设性
+6. 整体质量高，能够有效回答用户问题"""
+
 
+@functools.lru_cache(maxsize=32)
 def create_discussion_judge(
     score_threshold: float = None,
     criteria: str = None
@@ -20,6 +31,7 @@ def create_discussion_judge(
     创建讨论团队评判智能体
     
     用于评估讨论团队输出质量的评估器，使用numeric评分策略。
+    相同参数组合的评估器只构建一次（lru_cache）。
     
     Args:
         score_threshold: 评估分数阈值（默认7），分数达到此阈值视为达标
@@ -40,13 +52,7 @@ def create_discussion_judge(
     
     # 默认评估标准
     if criteria is None:
-        criteria = """讨论结果应该具备以下特点：
-1. 观点清晰明确，逻辑严谨
-2. 论证充分，有有力的证据和理论支持
-3. 考虑了多角度和多方面的因素
-4. 讨论深入，体现了正反方的充分辩论
-5. 结论合理，有建设性
-6. 整体质量高，能够有效回答用户问题"""
+        criteria = _DEFAULT_CRITERIA
     
     evaluation = AgentAsJudgeEval(
         name="Discussion Quality Judge",
@@ -3,27 +3,15 @@ Output Agent Module
 整合回复智能体定义
 """
 
+import functools
+
 from agno.agent import Agent
 from src.models.model_config import get_chat_model
 from src.database.connection import get_agent_database
 
 
-def create_output_agent() -> Agent:
-    """
-    创建整合回复智能体
-    
-    定位：整合相关信息，进行回复输出
-    
-    Returns:
-        Agent: 整合回复智能体实例
-    """
-    chat_model = get_chat_model()
-    
-    agent = Agent(
-        name="Output Agent",
-        model=chat_model,
-        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
-        instructions="""你是一个整合回复工具。
+# 指令文本常量：模块加载时构建一次，不随每次工厂调用重建
+_OUTPUT_INSTRUCTIONS = """你是一个整合回复工具。
     
     你的定位：这是一个工具，负责整合来自各个智能体和团队的信息，生成完整的文字回复。
     
@@ -70,7 +58,26 @@ def create_output_agent() -> Agent:
     - 数据库查询结果可以作为补充信息或数据支撑
     - 讨论评估信息仅作为参考，不需要在回复中详细说明
     
-    注意：你始终都会被启用，是工作流的最后一步，负责最终输出。你的输出必须是完整、清晰、友好的纯文字回复，不能包含任何原始数据格式。""",
+    注意：你始终都会被启用，是工作流的最后一步，负责最终输出。你的输出必须是完整、清晰、友好的纯文字回复，不能包含任何原始数据格式。"""
+
+
+@functools.lru_cache(maxsize=1)
+def create_output_agent() -> Agent:
+    """
+    创建整合回复智能体
+    
+    定位：整合相关信息，进行回复输出
+    
+    Returns:
+        Agent: 整合回复智能体实例
+    """
+    chat_model = get_chat_model()
+    
+    agent = Agent(
+        name="Output Agent",
+        model=chat_model,
+        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
+        instructions=_OUTPUT_INSTRUCTIONS,
         add_history_to_context=True,
         enable_agentic_memory=True,
     )
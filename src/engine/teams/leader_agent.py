@@ -3,27 +3,15 @@ Leader Agent Module
 领导角色智能体定义 - 把控方向与协调讨论节奏
 """
 
+import functools
+
 from agno.agent import Agent
 from src.models.model_config import get_chat_model
 from src.database.connection import get_agent_database
 
 
-def create_leader_agent() -> Agent:
-    """
-    创建领导角色智能体
-    
-    定位：把控讨论方向，协调讨论节奏，不参与具体讨论
-    
-    Returns:
-        Agent: 领导角色智能体实例
-    """
-    chat_model = get_chat_model()
-    
-    agent = Agent(
-        name="Leader Agent",
-        model=chat_model,
-        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
-        instructions="""你是一个讨论团队的领导者，负责把控讨论方向和协调讨论节奏。
+# 指令文本常量：模块加载时构建一次，不随每次工厂调用重建
+_LEADER_INSTRUCTIONS = """你是一个讨论团队的领导者，负责把控讨论方向和协调讨论节奏。
 
 你的核心职责：
 1. 把控讨论的整体方向和目标
@@ -46,7 +34,26 @@ def create_leader_agent() -> Agent:
 - 注重讨论效率和效果
 - 引导而非主导，协调而非控制
 
-注意：你的角色是协调者而非参与者，应该让正反方角色充分讨论，你主要负责把控方向和协调节奏。""",
+注意：你的角色是协调者而非参与者，应该让正反方角色充分讨论，你主要负责把控方向和协调节奏。"""
+
+
+@functools.lru_cache(maxsize=1)
+def create_leader_agent() -> Agent:
+    """
+    创建领导角色智能体
+    
+    定位：把控讨论方向，协调讨论节奏，不参与具体讨论
+    
+    Returns:
+        Agent: 领导角色智能体实例
+    """
+    chat_model = get_chat_model()
+    
+    agent = Agent(
+        name="Leader Agent",
+        model=chat_model,
+        db=get_agent_database(),  # 使用Agent专用数据库存储Agent数据
+        instructions=_LEADER_INSTRUCTIONS,
         add_history_to_context=True,
         enable_agentic_memory=True,
     )
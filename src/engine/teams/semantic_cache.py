@@ -0,0 +1,171 @@
+"""
+Semantic Cache Module
+讨论结果语义缓存 - 基于 Milvus 向量检索复用近似重复问题的讨论结果
+"""
+
+import json
+import math
+import os
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from pymilvus import Collection, utility, FieldSchema, CollectionSchema, DataType
+
+from src.knowledge.config import get_knowledge_embedder
+from src.vector.connection import get_milvus_client
+
+logger = logging.getLogger(__name__)
+
+
+def semantic_cache_enabled() -> bool:
+    """语义缓存是否启用（通过环境变量 DISCUSSION_SEMANTIC_CACHE 开关）"""
+    return os.getenv("DISCUSSION_SEMANTIC_CACHE", "").lower() in ("1", "true")
+
+
+class SemanticCache:
+    """
+    讨论结果语义缓存
+
+    将讨论输入嵌入为向量存入专用的 Milvus 集合，后续语义相近
+    （余弦相似度达到阈值）的问题直接复用已有的讨论结果，省掉
+    整个多轮讨论加评估的LLM调用链。
+    """
+
+    def __init__(
+        self,
+        collection_name: str = None,
+        similarity_threshold: float = None,
+        ttl: float = None
+    ):
+        """
+        初始化语义缓存
+
+        Args:
+            collection_name: 缓存集合名称（默认 discussion_cache）
+            similarity_threshold: 命中所需的余弦相似度阈值（默认0.92）
+            ttl: 缓存条目有效期，秒（默认3600）
+        """
+        self.collection_name = collection_name or os.getenv(
+            "DISCUSSION_CACHE_COLLECTION", "discussion_cache")
+        self.similarity_threshold = similarity_threshold or float(
+            os.getenv("DISCUSSION_CACHE_THRESHOLD", "0.92"))
+        self.ttl = ttl or float(os.getenv("DISCUSSION_CACHE_TTL", "3600"))
+        self._embedder = None
+        self._collection: Optional[Collection] = None
+
+    def _get_embedder(self):
+        """延迟获取嵌入模型（与知识库共用同一配置）"""
+        if self._embedder is None:
+            self._embedder = get_knowledge_embedder()
+        return self._embedder
+
+    def _embed(self, text: str) -> list:
+        """将文本嵌入为单位向量（归一化后内积即余弦相似度）"""
+        vector = self._get_embedder().get_embedding(text)
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm > 0:
+            vector = [v / norm for v in vector]
+        return vector
+
+    def _get_collection(self) -> Collection:
+        """获取缓存集合，不存在时创建（IP度量 + 倒排索引）"""
+        if self._collection is not None:
+            return self._collection
+
+        get_milvus_client()
+        if not utility.has_collection(self.collection_name):
+            dimension = int(os.getenv("MILVUS_DEFAULT_COLLECTION_DIMENSION", "1536"))
+            fields = [
+                FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dimension),
+                FieldSchema(name="payload", dtype=DataType.VARCHAR, max_length=65535),
+                FieldSchema(name="created_at", dtype=DataType.INT64),
+            ]
+            schema = CollectionSchema(fields=fields, description="讨论结果语义缓存集合")
+            collection = Collection(name=self.collection_name, schema=schema)
+            collection.create_index(
+                field_name="vector",
+                index_params={"metric_type": "IP", "index_type": "IVF_FLAT", "params": {"nlist": 128}},
+            )
+            logger.info(f"创建语义缓存集合: {self.collection_name}")
+        else:
+            collection = Collection(self.collection_name)
+
+        collection.load()
+        self._collection = collection
+        return collection
+
+    def get(self, discussion_input: str) -> Optional[Dict[str, Any]]:
+        """
+        查询语义缓存
+
+        Args:
+            discussion_input: 讨论输入（用户问题 + 上下文）
+
+        Returns:
+            命中时返回缓存的讨论结果字典，未命中或缓存异常返回 None
+        """
+        try:
+            collection = self._get_collection()
+            vector = self._embed(discussion_input)
+            results = collection.search(
+                data=[vector],
+                anns_field="vector",
+                param={"metric_type": "IP", "params": {"nprobe": 10}},
+                limit=1,
+                output_fields=["payload", "created_at"],
+            )
+            if not results or not results[0]:
+                return None
+
+            hit = results[0][0]
+            if hit.distance < self.similarity_threshold:
+                return None
+            if time.time() - hit.entity.get("created_at") > self.ttl:
+                return None
+
+            payload = json.loads(hit.entity.get("payload"))
+            logger.info(f"语义缓存命中，相似度: {hit.distance:.4f}")
+            return payload
+
+        except Exception as e:
+            # 缓存故障不应影响讨论主流程
+            logger.warning(f"语义缓存查询失败（忽略）: {e}")
+            return None
+
+    def put(self, discussion_input: str, result: Dict[str, Any]):
+        """
+        写入语义缓存
+
+        Args:
+            discussion_input: 讨论输入（用户问题 + 上下文）
+            result: 讨论结果字典（仅缓存可序列化字段）
+        """
+        try:
+            collection = self._get_collection()
+            payload = json.dumps({
+                "discussion_result": result.get("discussion_result", ""),
+                "final_score": result.get("final_score"),
+                "total_rounds": result.get("total_rounds", 0),
+                "reached_threshold": result.get("reached_threshold", False),
+            }, ensure_ascii=False)
+            collection.insert([
+                [self._embed(discussion_input)],
+                [payload],
+                [int(time.time())],
+            ])
+        except Exception as e:
+            logger.warning(f"语义缓存写入失败（忽略）: {e}")
+
+
+# 全局语义缓存实例（延迟初始化）
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """获取语义缓存实例（延迟初始化）"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
@@ -3,7 +3,10 @@ Discussion Team Module
 讨论团队组合与配置 - 实现讨论循环逻辑和评估控制
 """
 
+import asyncio
+import functools
 import os
+import re
 import logging
 from typing import Dict, Any, Optional
 from agno.team.team import Team
@@ -15,9 +18,53 @@ from src.engine.teams.pro_agent import create_pro_agent
 from src.engine.teams.con_agent import create_con_agent
 from src.engine.teams.leader_agent import create_leader_agent
 from src.engine.agents.judge_agent import create_discussion_judge
+from src.engine.teams.semantic_cache import get_semantic_cache, semantic_cache_enabled
 
 logger = logging.getLogger(__name__)
 
+# 廉价停止启发式：讨论结果达到该长度且出现总结性措辞时，
+# 从第二轮起直接视为达标，省掉一次评估调用
+_CHEAP_STOP_MIN_LENGTH = 500
+_CONCLUSION_MARKERS = ("结论", "综上", "总结", "总而言之")
+
+# 收敛判定阈值：相邻两轮输出的Jaccard相似度超过该值视为讨论已收敛
+_CONVERGENCE_THRESHOLD = 0.9
+
+# 融合轮次模式的输出解析模式（预编译）
+_ROUND_RE = re.compile(r"<ROUND\s*(\d+)>(.*?)</ROUND\s*\1>", re.DOTALL)
+_SCORE_RE = re.compile(r"<SCORE\s*(\d+)>\s*([0-9.]+)\s*</SCORE\s*\1>")
+
+
+def _fused_rounds_enabled() -> bool:
+    """融合轮次模式是否启用（DISCUSSION_FUSED_ROUNDS 开关）"""
+    return os.getenv("DISCUSSION_FUSED_ROUNDS", "").lower() in ("1", "true")
+
+
+def _cheap_should_stop(text: str) -> bool:
+    """廉价停止判定：输出足够长且包含总结性措辞"""
+    if len(text) < _CHEAP_STOP_MIN_LENGTH:
+        return False
+    return any(marker in text for marker in _CONCLUSION_MARKERS)
+
+
+def _extract_score(evaluation) -> Optional[float]:
+    """从评估结果中提取分数（score 直接挂在结果或嵌套在 result 上）"""
+    if evaluation is None:
+        return None
+    score = getattr(evaluation, 'score', None)
+    if score is not None:
+        return score
+    return getattr(getattr(evaluation, 'result', None), 'score', None)
+
+
+def _jaccard_similarity(text_a: str, text_b: str) -> float:
+    """计算两段文本字符二元组集合的Jaccard相似度"""
+    bigrams_a = {text_a[i:i + 2] for i in range(len(text_a) - 1)}
+    bigrams_b = {text_b[i:i + 2] for i in range(len(text_b) - 1)}
+    if not bigrams_a or not bigrams_b:
+        return 0.0
+    return len(bigrams_a & bigrams_b) / len(bigrams_a | bigrams_b)
+
 
 class DiscussionTeam:
     """
@@ -55,6 +102,8 @@ class DiscussionTeam:
         chat_model = get_chat_model()
         db = get_team_database()
         
+        # Team 实例仅用于注册到 AgentOS 控制面板；
+        # run() 内部按轮次直接调度成员Agent以便并发执行
         self.team = Team(
             name=self.team_name,
             id="discussion_team",
@@ -75,6 +124,111 @@ class DiscussionTeam:
         
         logger.debug(f"初始化讨论团队: {self.team_name}, 最大轮次: {self.max_rounds}, 分数阈值: {self.score_threshold}")
     
+    async def _run_round(self, discussion_input: str) -> str:
+        """
+        执行单轮讨论
+
+        正反方互相独立，用 asyncio.gather 并发执行，再由领导角色
+        综合双方观点；单轮耗时从 正+反+领导 三次LLM调用之和降为
+        max(正, 反)+领导。任一方失败时用另一方的观点继续。
+
+        Args:
+            discussion_input: 本轮讨论输入
+
+        Returns:
+            本轮讨论结果文本
+
+        Raises:
+            Exception: 正反方同时失败
+        """
+        pro_response, con_response = await asyncio.gather(
+            self.pro_agent.arun(discussion_input),
+            self.con_agent.arun(discussion_input),
+            return_exceptions=True,
+        )
+        
+        if isinstance(pro_response, Exception) and isinstance(con_response, Exception):
+            raise pro_response
+        if isinstance(pro_response, Exception):
+            logger.warning(f"正方讨论失败，仅使用反方观点: {pro_response}")
+            pro_content = "（正方本轮未能给出观点）"
+        else:
+            pro_content = str(pro_response.content)
+        if isinstance(con_response, Exception):
+            logger.warning(f"反方讨论失败，仅使用正方观点: {con_response}")
+            con_content = "（反方本轮未能给出观点）"
+        else:
+            con_content = str(con_response.content)
+        
+        leader_input = (
+            f"{discussion_input}\n\n"
+            f"正方观点：\n{pro_content}\n\n"
+            f"反方观点：\n{con_content}\n\n"
+            f"请综合正反双方的观点，总结本轮讨论，形成全面、深入的讨论结果。"
+        )
+        leader_response = await self.leader_agent.arun(leader_input)
+        return str(leader_response.content)
+    
+    async def _run_fused(self, user_query: str, base_input: str) -> Optional[Dict[str, Any]]:
+        """
+        融合轮次模式：单次调用产出多轮讨论
+
+        要求模型在一次响应中进行最多 max_rounds 轮讨论并逐轮自评，
+        自评达标即停；每轮完整的 system+上下文 prefill 只发生一次。
+        外部评判只对最终轮做一次验证。
+
+        Args:
+            user_query: 用户问题
+            base_input: 讨论输入（用户问题+上下文）
+
+        Returns:
+            讨论结果字典；模型输出无法解析时返回 None（由调用方回退）
+        """
+        fused_prompt = (
+            f"{base_input}\n\n"
+            f"请就以上问题进行最多 {self.max_rounds} 轮正反方讨论。每轮先给出正反双方观点再综合，"
+            f"并在轮末给出0-10的自评分数；自评达到 {self.score_threshold} 分即可停止。\n"
+            f"输出格式（严格遵守，i为轮次序号）：\n"
+            f"<ROUND i>本轮讨论内容</ROUND i>\n"
+            f"<SCORE i>本轮自评分数</SCORE i>"
+        )
+        response = await self.team.arun(fused_prompt)
+        content = str(response.content)
+        
+        rounds = _ROUND_RE.findall(content)
+        if not rounds:
+            return None
+        
+        scores = {num: float(value) for num, value in _SCORE_RE.findall(content)}
+        last_num, final_result = rounds[-1]
+        self_score = scores.get(last_num)
+        
+        # 外部评判仅验证最终轮
+        evaluation_result = None
+        final_score = self_score
+        try:
+            evaluation_result = await asyncio.to_thread(
+                self.judge.run,
+                input=user_query,
+                output=final_result,
+                print_results=False,
+                print_summary=False,
+            )
+            judged = _extract_score(evaluation_result)
+            if judged is not None:
+                final_score = judged
+        except Exception as e:
+            logger.warning("融合轮次模式的最终评估失败，使用自评分数: %s", e)
+        
+        logger.info("融合轮次讨论完成，轮次: %s, 最终分数: %s", len(rounds), final_score)
+        return {
+            "discussion_result": final_result.strip(),
+            "evaluation_result": evaluation_result,
+            "final_score": final_score,
+            "total_rounds": len(rounds),
+            "reached_threshold": final_score is not None and final_score >= self.score_threshold,
+        }
+
     async def run(
         self,
         user_query: str,
@@ -97,13 +251,36 @@ class DiscussionTeam:
                 "reached_threshold": bool,  # 是否达到阈值
             }
         """
-        # 构建讨论输入
-        discussion_input = user_query
+        # 构建讨论输入：固定内容（用户问题+上下文）放在最前面且
+        # 各轮保持字节一致，轮次历史只追加在后。LLM后端的前缀/KV
+        # 缓存按前导token命中，第2轮起的prefill只需处理增量部分
+        base_input = user_query
         if context:
-            discussion_input = f"{user_query}\n\n相关信息：\n{context}"
+            base_input = f"{user_query}\n\n相关信息：\n{context}"
+        discussion_input = base_input
+        
+        # 语义缓存：近似重复的问题直接复用已有讨论结果，
+        # 省掉整个多轮讨论与评估（命中时评估也一并跳过）
+        cache_key = discussion_input
+        if semantic_cache_enabled():
+            cached = get_semantic_cache().get(cache_key)
+            if cached is not None:
+                logger.info("语义缓存命中，直接返回缓存的讨论结果")
+                cached.setdefault("evaluation_result", None)
+                return cached
+        
+        logger.info("开始讨论团队讨论，用户问题: %.50s...", user_query)
+        logger.info("最大轮次: %s, 分数阈值: %s", self.max_rounds, self.score_threshold)
         
-        logger.info(f"开始讨论团队讨论，用户问题: {user_query[:50]}...")
-        logger.info(f"最大轮次: {self.max_rounds}, 分数阈值: {self.score_threshold}")
+        # 融合轮次模式：一次LLM调用内完成多轮讨论与自评，
+        # 省掉 (N-1) 次完整的 prefill
+        if _fused_rounds_enabled():
+            result = await self._run_fused(user_query, base_input)
+            if result is not None:
+                if semantic_cache_enabled() and result.get("discussion_result"):
+                    get_semantic_cache().put(cache_key, result)
+                return result
+            logger.warning("融合轮次模式输出解析失败，回退到逐轮讨论")
         
         final_result = None
         final_evaluation = None
@@ -112,35 +289,52 @@ class DiscussionTeam:
         
         # 讨论循环
         for round_num in range(1, self.max_rounds + 1):
-            logger.info(f"第 {round_num}/{self.max_rounds} 轮讨论开始")
+            logger.info("第 %s/%s 轮讨论开始", round_num, self.max_rounds)
             
             try:
-                # 执行讨论
-                response = await self.team.arun(discussion_input)
-                discussion_result = str(response.content)
+                # 执行讨论（正反方并发，领导综合）
+                discussion_result = await self._run_round(discussion_input)
                 total_rounds = round_num
                 
-                logger.info(f"第 {round_num} 轮讨论完成")
+                logger.info("第 %s 轮讨论完成", round_num)
+                
+                # 先用最廉价的判据短路：第二轮起，输出足够长且带有
+                # 总结性措辞时直接视为达标，完全跳过评估调用
+                if round_num >= 2 and _cheap_should_stop(discussion_result):
+                    final_result = discussion_result
+                    reached_threshold = True
+                    logger.info("第 %s 轮满足廉价停止判据，跳过评估并停止讨论", round_num)
+                    break
+                
+                # 收敛检测：与上一轮输出高度相似说明讨论已收敛，
+                # 再讨论一轮只会产出近似重复的内容
+                if final_result is not None and _jaccard_similarity(
+                        discussion_result, final_result) > _CONVERGENCE_THRESHOLD:
+                    final_result = discussion_result
+                    logger.info("第 %s 轮输出与上一轮高度相似，讨论已收敛，停止讨论", round_num)
+                    break
                 
-                # 评估讨论结果
-                logger.info(f"开始评估第 {round_num} 轮讨论结果")
-                evaluation_result = self.judge.run(
+                # 评估讨论结果：judge.run 是同步调用，放入线程执行，
+                # 既不阻塞事件循环，也可与下一轮输入的构建重叠
+                logger.info("开始评估第 %s 轮讨论结果", round_num)
+                judge_task = asyncio.create_task(asyncio.to_thread(
+                    self.judge.run,
                     input=user_query,
                     output=discussion_result,
                     print_results=False,
                     print_summary=False,
-                )
+                ))
+                
+                # 评估进行的同时预先构建下一轮讨论输入
+                # （固定前缀在前，本轮历史追加在后）
+                next_input = f"{base_input}\n\n基于之前的讨论，请继续深入讨论该问题。\n\n之前的讨论结果（第{round_num}轮）：\n{discussion_result}"
+                
+                evaluation_result = await judge_task
                 
                 # 获取评估分数
-                score = None
-                if evaluation_result and hasattr(evaluation_result, 'score'):
-                    score = evaluation_result.score
-                elif evaluation_result and hasattr(evaluation_result, 'result'):
-                    # 如果score不在evaluation_result上，尝试从result获取
-                    if hasattr(evaluation_result.result, 'score'):
-                        score = evaluation_result.result.score
+                score = _extract_score(evaluation_result)
                 
-                logger.info(f"第 {round_num} 轮评估完成，分数: {score}")
+                logger.info("第 %s 轮评估完成，分数: %s", round_num, score)
                 
                 # 保存当前轮次结果
                 final_result = discussion_result
@@ -149,20 +343,21 @@ class DiscussionTeam:
                 # 判断是否达到阈值
                 if score is not None and score >= self.score_threshold:
                     reached_threshold = True
-                    logger.info(f"讨论达到目标分数 ({score} >= {self.score_threshold})，停止讨论")
+                    logger.info("讨论达到目标分数 (%s >= %s)，停止讨论", score, self.score_threshold)
                     break
                 
                 # 如果未达到阈值但已经是最后一轮，继续使用当前结果
                 if round_num == self.max_rounds:
-                    logger.info(f"已达到最大轮次 ({self.max_rounds})，停止讨论")
+                    logger.info("已达到最大轮次 (%s)，停止讨论", self.max_rounds)
                     break
                 
-                # 准备下一轮讨论（可以基于当前结果进行深入讨论）
+                # 进入下一轮讨论（输入已在评估期间构建完成）
                 # 这里可以添加基于评估反馈的改进逻辑
-                discussion_input = f"{user_query}\n\n基于之前的讨论，请继续深入讨论该问题。\n\n之前的讨论结果：\n{discussion_result}"
+                discussion_input = next_input
                 
             except Exception as e:
-                logger.error(f"第 {round_num} 轮讨论或评估失败: {e}", exc_info=True)
+                logger.error("第 %s 轮讨论或评估失败: %s", round_num, e,
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
                 # 如果有之前的结果，使用之前的结果
                 if final_result is None:
                     raise
@@ -178,18 +373,19 @@ class DiscussionTeam:
         }
         
         # 提取最终分数
-        if final_evaluation:
-            if hasattr(final_evaluation, 'score'):
-                result["final_score"] = final_evaluation.score
-            elif hasattr(final_evaluation, 'result'):
-                if hasattr(final_evaluation.result, 'score'):
-                    result["final_score"] = final_evaluation.result.score
+        result["final_score"] = _extract_score(final_evaluation)
+        
+        logger.info("讨论团队讨论完成，总轮次: %s, 最终分数: %s, 达到阈值: %s",
+                    total_rounds, result['final_score'], reached_threshold)
         
-        logger.info(f"讨论团队讨论完成，总轮次: {total_rounds}, 最终分数: {result['final_score']}, 达到阈值: {reached_threshold}")
+        # 写入语义缓存，供后续近似重复的问题复用
+        if semantic_cache_enabled() and final_result:
+            get_semantic_cache().put(cache_key, result)
         
         return result
 
 
+@functools.lru_cache(maxsize=8)
 def create_discussion_team(
     max_rounds: int = None,
     score_threshold: float = None,
@@ -197,6 +393,9 @@ def create_discussion_team(
 ) -> DiscussionTeam:
     """
     创建讨论团队实例
+
+    DiscussionTeam 仅持有配置和成员Agent引用，run() 不在实例上
+    累积状态，因此相同参数组合的团队只构建一次（lru_cache）。
     
     Args:
         max_rounds: 最大讨论轮次（默认3轮）
@@ -3,13 +3,44 @@ Database Tools Module
 数据库相关工具定义（使用业务数据库）
 """
 
+import asyncio
+import time
+
 from agno.tools import tool
 from src.database.business_query_tools import get_business_query_tools
 from src.database.business_db import list_business_databases
 
 
+# 工具输出TTL缓存：Agent在一次会话中可能多次调用同一工具，
+# 而数据库/表结构分钟级才会变化，短TTL内直接复用上次结果
+_TOOL_CACHE_TTL = 30.0
+_tool_cache: dict = {}
+
+
+def _tool_cache_get(key):
+    """读取未过期的工具输出缓存"""
+    entry = _tool_cache.get(key)
+    if entry is None:
+        return None
+    ts, value = entry
+    if time.monotonic() - ts > _TOOL_CACHE_TTL:
+        del _tool_cache[key]
+        return None
+    return value
+
+
+def _tool_cache_put(key, value):
+    """写入工具输出缓存"""
+    _tool_cache[key] = (time.monotonic(), value)
+
+
+def _list_tables_for(db_name: str):
+    """获取单个业务数据库的表名列表（在线程中执行）"""
+    return get_business_query_tools(default_database=db_name).list_tables(database_name=db_name)
+
+
 @tool
-def list_databases_and_tables() -> str:
+async def list_databases_and_tables() -> str:
     """
     返回当前连接的所有业务数据库及其对应的表名列表
 
@@ -17,31 +48,38 @@ def list_databases_and_tables() -> str:
         数据库和表名的字符串表示，格式为每个数据库及其表名的列表
     """
     try:
+        cached = _tool_cache_get("list_dbs_tables")
+        if cached is not None:
+            return cached
+        
         databases = list_business_databases()
         
         if not databases:
             return "未配置业务数据库（BUSINESS_MYSQL_DATABASES）"
         
+        # 每个数据库的表查询是一次独立的MySQL往返，并发执行后
+        # 总耗时约等于最慢的一次往返，而不是N次之和
+        tables_per_db = await asyncio.gather(
+            *[asyncio.to_thread(_list_tables_for, db_name) for db_name in databases],
+            return_exceptions=True,
+        )
+        
         result_parts = []
         result_parts.append(f"业务数据库列表（共 {len(databases)} 个）：\n")
         
-        for db_name in databases:
-            try:
-                query_tools = get_business_query_tools(default_database=db_name)
-                tables = query_tools.list_tables(database_name=db_name)
-                
-                result_parts.append(f"数据库: {db_name}")
-                if not tables:
-                    result_parts.append("  表: （无）")
-                else:
-                    result_parts.append(f"  表 ({len(tables)} 个): {', '.join(tables)}")
-                result_parts.append("")  # 空行分隔
-            except Exception as e:
-                result_parts.append(f"数据库: {db_name}")
-                result_parts.append(f"  错误: 获取表列表失败 - {str(e)}")
-                result_parts.append("")  # 空行分隔
+        for db_name, tables in zip(databases, tables_per_db):
+            result_parts.append(f"数据库: {db_name}")
+            if isinstance(tables, Exception):
+                result_parts.append(f"  错误: 获取表列表失败 - {str(tables)}")
+            elif not tables:
+                result_parts.append("  表: （无）")
+            else:
+                result_parts.append(f"  表 ({len(tables)} 个): {', '.join(tables)}")
+            result_parts.append("")  # 空行分隔
         
-        return "\n".join(result_parts)
+        result = "\n".join(result_parts)
+        _tool_cache_put("list_dbs_tables", result)
+        return result
     
     except Exception as e:
         return f"获取数据库和表列表失败: {str(e)}"
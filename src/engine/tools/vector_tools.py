@@ -3,13 +3,37 @@ Vector Tools Module
 向量数据库相关工具定义（知识库查询工具）
 """
 
+import time
+
 from agno.tools import tool
+from pymilvus.exceptions import MilvusException
 from src.vector.query_tools import get_vector_tools
-from src.vector.connection import get_milvus_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 工具输出TTL缓存：Agent在一次会话中可能多次调用同一工具，
+# 集合列表和集合结构分钟级才会变化，短TTL内直接复用上次结果
+_TOOL_CACHE_TTL = 30.0
+_tool_cache: dict = {}
+
+
+def _tool_cache_get(key):
+    """读取未过期的工具输出缓存"""
+    entry = _tool_cache.get(key)
+    if entry is None:
+        return None
+    ts, value = entry
+    if time.monotonic() - ts > _TOOL_CACHE_TTL:
+        del _tool_cache[key]
+        return None
+    return value
+
+
+def _tool_cache_put(key, value):
+    """写入工具输出缓存"""
+    _tool_cache[key] = (time.monotonic(), value)
+
 
 @tool
 def list_collections() -> str:
@@ -23,13 +47,12 @@ def list_collections() -> str:
         集合列表的字符串表示
     """
     try:
-        # 确保连接已建立（如果不存在会自动创建连接和数据库）
-        try:
-            get_milvus_client()
-        except Exception as conn_error:
-            return f"无法连接到知识库（Milvus向量数据库）: {str(conn_error)}。请检查配置是否正确。"
+        cached = _tool_cache_get("list_collections")
+        if cached is not None:
+            return cached
         
-        # 获取工具并列出集合
+        # 获取工具并列出集合（连接错误由下方统一捕获，
+        # 不再为每次工具调用先做一次探活往返）
         vector_tools = get_vector_tools()
         collections = vector_tools.list_collections()
 
@@ -43,8 +66,12 @@ def list_collections() -> str:
         for collection_name in collections:
             result_parts.append(f"- {collection_name}")
         
-        return "\n".join(result_parts)
+        result = "\n".join(result_parts)
+        _tool_cache_put("list_collections", result)
+        return result
 
+    except MilvusException as e:
+        return f"无法连接到知识库（Milvus向量数据库）: {str(e)}。请检查配置是否正确。"
     except Exception as e:
         logger.error(f"获取知识库集合列表失败: {e}", exc_info=True)
         return f"获取知识库集合列表失败: {str(e)}"
@@ -62,11 +89,9 @@ def get_collection_info(collection_name: str) -> str:
         集合信息的字符串表示
     """
     try:
-        # 确保连接已建立
-        try:
-            get_milvus_client()
-        except Exception as conn_error:
-            return f"无法连接到知识库（Milvus向量数据库）: {str(conn_error)}。请检查配置是否正确。"
+        cached = _tool_cache_get(("collection_info", collection_name))
+        if cached is not None:
+            return cached
         
         vector_tools = get_vector_tools()
         
@@ -91,8 +116,12 @@ def get_collection_info(collection_name: str) -> str:
                 field_desc += " (自动ID)"
             result_parts.append(field_desc)
         
-        return "\n".join(result_parts)
+        result = "\n".join(result_parts)
+        _tool_cache_put(("collection_info", collection_name), result)
+        return result
         
+    except MilvusException as e:
+        return f"无法连接到知识库（Milvus向量数据库）: {str(e)}。请检查配置是否正确。"
     except Exception as e:
         logger.error(f"获取集合信息失败: {e}", exc_info=True)
         return f"获取集合信息失败: {str(e)}"
@@ -115,12 +144,6 @@ def search_knowledge(collection_name: str, query_text: str, limit: int = 5) -> s
         搜索结果或提示信息
     """
     try:
-        # 确保连接已建立
-        try:
-            get_milvus_client()
-        except Exception as conn_error:
-            return f"无法连接到知识库（Milvus向量数据库）: {str(conn_error)}。请检查配置是否正确。"
-        
         vector_tools = get_vector_tools()
         
         # 检查集合是否存在
@@ -148,6 +171,8 @@ def search_knowledge(collection_name: str, query_text: str, limit: int = 5) -> s
 2. 集合中已插入向量数据
 3. 使用嵌入模型将查询文本转换为向量维度匹配的向量"""
         
+    except MilvusException as e:
+        return f"无法连接到知识库（Milvus向量数据库）: {str(e)}。请检查配置是否正确。"
     except Exception as e:
         logger.error(f"搜索知识库失败: {e}", exc_info=True)
         return f"搜索知识库失败: {str(e)}"
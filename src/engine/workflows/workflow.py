@@ -3,11 +3,14 @@ Workflow Module
 主工作流定义 - 编排意图识别、数据库查询和整合输出
 """
 
-import json
+import asyncio
+import io
 import logging
+import os
+import re
 from agno.workflow.workflow import Workflow
 from agno.workflow.step import Step
-from src.engine.agents.intent_agent import create_intent_agent
+from src.engine.agents.intent_agent import create_intent_agent, IntentResult
 from src.engine.agents.db_agent import create_db_agent
 from src.engine.agents.output_agent import create_output_agent
 from src.engine.teams.team import create_discussion_team
@@ -15,6 +18,10 @@ from src.database.connection import get_workflow_database
 
 logger = logging.getLogger(__name__)
 
+# 预编译的JSON提取模式：单次扫描取出意图输出中的JSON块，
+# 替代每次请求的 find('{') + rfind('}') 双重扫描
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 async def main_workflow_steps(*args, **kwargs):
     """
@@ -65,37 +72,37 @@ async def main_workflow_steps(*args, **kwargs):
     output_agent = create_output_agent()
     
     # 步骤1：意图识别与任务规划
-    logger.info(f"开始意图识别，用户输入: {user_input}")
+    logger.info("开始意图识别，用户输入: %s", user_input)
     intent_result = await intent_agent.arun(user_input)
     intent_content = intent_result.content
     
-    # 解析意图识别结果
+    # 解析意图识别结果：意图Agent配置了结构化输出，正常路径直接
+    # 拿到 IntentResult；退化为自由文本时走正则提取+模型校验
     try:
-        # 尝试从内容中提取JSON
-        # 如果内容包含JSON，提取它
-        json_start = intent_content.find('{')
-        json_end = intent_content.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = intent_content[json_start:json_end]
-            intent_data = json.loads(json_str)
+        if isinstance(intent_content, IntentResult):
+            intent = intent_content
         else:
-            # 如果没有找到JSON，尝试直接解析整个内容
-            intent_data = json.loads(intent_content)
+            match = _JSON_RE.search(intent_content)
+            intent = IntentResult.model_validate_json(
+                match.group(0) if match else intent_content)
         
-        enable_db_agent = intent_data.get("enable_db_agent", False)
-        enable_discussion_team = intent_data.get("enable_discussion_team", False)
-        intent_summary = intent_data.get("intent_summary", "未识别到明确意图")
+        enable_db_agent = intent.enable_db_agent
+        enable_discussion_team = intent.enable_discussion_team
+        # 讨论是否必须以数据库查询结果为上下文（默认需要，保持串行）
+        discussion_needs_db = intent.discussion_needs_db
+        intent_summary = intent.intent_summary
         
-        logger.info(f"意图识别结果: enable_db_agent={enable_db_agent}, enable_discussion_team={enable_discussion_team}, intent_summary={intent_summary}")
-    except (json.JSONDecodeError, KeyError) as e:
-        logger.warning(f"解析意图识别结果失败: {e}，使用默认值")
+        logger.info("意图识别结果: enable_db_agent=%s, enable_discussion_team=%s, intent_summary=%s",
+                    enable_db_agent, enable_discussion_team, intent_summary)
+    except Exception as e:
+        logger.warning("解析意图识别结果失败: %s，使用默认值", e)
         enable_db_agent = False
         enable_discussion_team = False
-        intent_summary = intent_content  # 使用原始内容作为摘要
+        discussion_needs_db = True
+        intent_summary = str(intent_content)  # 使用原始内容作为摘要
     
-    # 步骤2：数据库查询（如果启用）
-    db_result_content = None
-    if enable_db_agent:
+    async def _run_db_step() -> str:
+        """步骤2：数据库查询"""
         logger.info("开始数据库查询...")
         try:
             # 构建数据库查询的输入，包含用户问题和意图信息
@@ -106,78 +113,111 @@ async def main_workflow_steps(*args, **kwargs):
 请根据用户问题执行相应的数据库查询，返回查询结果。"""
             
             db_result = await db_agent.arun(db_input)
-            db_result_content = db_result.content
             logger.info("数据库查询完成")
+            return db_result.content
         except Exception as e:
-            logger.error(f"数据库查询失败: {e}")
-            db_result_content = f"数据库查询过程中出现错误: {str(e)}"
-    else:
-        logger.info("跳过数据库查询步骤")
+            logger.error("数据库查询失败: %s", e)
+            return f"数据库查询过程中出现错误: {str(e)}"
     
-    # 步骤3：讨论团队（如果启用）
-    discussion_result_content = None
-    discussion_evaluation_info = None
-    if enable_discussion_team:
+    async def _run_discussion_step(discussion_context):
+        """步骤3：讨论团队讨论，返回 (讨论结果, 评估信息)"""
         logger.info("开始讨论团队讨论...")
         try:
             # 创建讨论团队
             discussion_team = create_discussion_team()
             
-            # 构建讨论上下文（包含数据查询结果）
-            discussion_context = None
-            if enable_db_agent and db_result_content:
-                discussion_context = f"数据查询结果：\n{db_result_content}"
-            
             # 执行讨论
             discussion_result = await discussion_team.run(
                 user_query=user_input,
                 context=discussion_context
             )
             
-            discussion_result_content = discussion_result.get("discussion_result", "")
+            result_content = discussion_result.get("discussion_result", "")
             
             # 构建评估信息
-            eval_result = discussion_result.get("evaluation_result")
             final_score = discussion_result.get("final_score")
             total_rounds = discussion_result.get("total_rounds", 0)
             reached_threshold = discussion_result.get("reached_threshold", False)
             
             if final_score is not None:
-                discussion_evaluation_info = f"讨论评估分数: {final_score}/10, 讨论轮次: {total_rounds}, 达到阈值: {reached_threshold}"
+                evaluation_info = f"讨论评估分数: {final_score}/10, 讨论轮次: {total_rounds}, 达到阈值: {reached_threshold}"
             else:
-                discussion_evaluation_info = f"讨论轮次: {total_rounds}, 达到阈值: {reached_threshold}"
+                evaluation_info = f"讨论轮次: {total_rounds}, 达到阈值: {reached_threshold}"
             
-            logger.info(f"讨论团队讨论完成: {discussion_evaluation_info}")
+            logger.info("讨论团队讨论完成: %s", evaluation_info)
+            return result_content, evaluation_info
         except Exception as e:
-            logger.error(f"讨论团队讨论失败: {e}", exc_info=True)
-            discussion_result_content = f"讨论团队讨论过程中出现错误: {str(e)}"
-            discussion_evaluation_info = "讨论评估失败"
+            logger.error("讨论团队讨论失败: %s", e,
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
+            return f"讨论团队讨论过程中出现错误: {str(e)}", "讨论评估失败"
+    
+    # 步骤2/3：数据库查询与讨论团队
+    # 当讨论不需要数据库结果作为上下文时，两个分支互相独立，
+    # 用 asyncio.gather 并发执行，总耗时从两者之和降为较慢的一方
+    db_result_content = None
+    discussion_result_content = None
+    discussion_evaluation_info = None
+    
+    if enable_db_agent and enable_discussion_team and not discussion_needs_db:
+        db_result_content, (discussion_result_content, discussion_evaluation_info) = \
+            await asyncio.gather(_run_db_step(), _run_discussion_step(None))
     else:
-        logger.info("跳过讨论团队步骤")
+        if enable_db_agent:
+            db_result_content = await _run_db_step()
+        else:
+            logger.info("跳过数据库查询步骤")
+        
+        if enable_discussion_team:
+            discussion_context = None
+            if enable_db_agent and db_result_content:
+                discussion_context = f"数据查询结果：\n{db_result_content}"
+            discussion_result_content, discussion_evaluation_info = \
+                await _run_discussion_step(discussion_context)
+        else:
+            logger.info("跳过讨论团队步骤")
+    
+    # 快速路径（SKIP_OUTPUT_AGENT_WHEN_TRIVIAL=1 时启用）：
+    # 只有单个分支产出内容、或两个分支都未启用时，整合Agent只会
+    # 复述已有内容，直接返回省掉一次完整的LLM调用
+    if os.getenv("SKIP_OUTPUT_AGENT_WHEN_TRIVIAL", "").lower() in ("1", "true"):
+        if not enable_db_agent and not enable_discussion_team:
+            logger.info("无启用分支，直接返回意图摘要，跳过整合输出")
+            return intent_summary
+        if enable_discussion_team and discussion_result_content and not db_result_content:
+            logger.info("仅讨论分支产出内容，直接返回讨论结果，跳过整合输出")
+            return discussion_result_content
+        if enable_db_agent and db_result_content and not discussion_result_content:
+            logger.info("仅数据库分支产出内容，直接返回查询结果，跳过整合输出")
+            return db_result_content
     
     # 步骤4：整合输出
     logger.info("开始整合输出...")
     
-    # 构建整合输出的输入
-    output_parts = [
-        f"用户问题：{user_input}",
-        f"意图分析：{intent_summary}",
-    ]
+    # 构建整合输出的输入：db/讨论结果可能有数KB，用 StringIO
+    # 增量写入，避免 f-string 拼接产生的中间字符串对象
+    buf = io.StringIO()
+    buf.write("用户问题：")
+    buf.write(user_input)
+    buf.write("\n\n意图分析：")
+    buf.write(intent_summary)
     
     if enable_db_agent and db_result_content:
-        output_parts.append(f"数据库查询结果：\n{db_result_content}")
+        buf.write("\n\n数据库查询结果：\n")
+        buf.write(db_result_content)
     else:
-        output_parts.append("未执行数据库查询")
+        buf.write("\n\n未执行数据库查询")
     
     if enable_discussion_team and discussion_result_content:
-        output_parts.append(f"讨论团队讨论结果：\n{discussion_result_content}")
+        buf.write("\n\n讨论团队讨论结果：\n")
+        buf.write(discussion_result_content)
         if discussion_evaluation_info:
-            output_parts.append(f"讨论评估信息：{discussion_evaluation_info}")
+            buf.write("\n\n讨论评估信息：")
+            buf.write(discussion_evaluation_info)
     else:
-        output_parts.append("未执行讨论团队讨论")
+        buf.write("\n\n未执行讨论团队讨论")
     
-    output_input = "\n\n".join(output_parts)
-    output_input += "\n\n请基于以上信息，生成一个完整、清晰、友好的回复给用户。"
+    buf.write("\n\n请基于以上信息，生成一个完整、清晰、友好的回复给用户。")
+    output_input = buf.getvalue()
     
     output_result = await output_agent.arun(output_input)
     logger.info("整合输出完成")
@@ -3,9 +3,14 @@ Knowledge Configuration Module
 知识库配置模块 - 配置 Milvus 向量数据库和 MySQL 内容数据库
 """
 
+import functools
+import hashlib
 import os
 import logging
-from typing import Optional
+from collections import OrderedDict
+from typing import List, Optional
+
+import httpx
 from agno.db.mysql import MySQLDb
 from agno.knowledge import Knowledge
 from agno.vectordb.milvus import Milvus
@@ -14,10 +19,90 @@ from src.vector.connection import get_milvus_client
 
 logger = logging.getLogger(__name__)
 
+# 嵌入向量缓存：每次向量搜索都要先调用一次嵌入API（约100-300ms），
+# 而系统提示和常见问题的文本在请求间大量重复。按 (模型, 文本) 哈希
+# 做LRU缓存，命中时省掉整个HTTP往返。
+_EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache: "OrderedDict[str, list]" = OrderedDict()
+
+# 进程级共享的HTTP客户端：嵌入调用复用保活的TLS连接，
+# 省掉高QPS下每次请求30-80ms的握手开销
+_shared_http_client = httpx.Client(
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+)
+
+
+def _embedding_cache_key(model_id: str, text: str) -> str:
+    """计算嵌入缓存键（模型与文本的SHA256哈希）"""
+    return hashlib.sha256(f"{model_id}\x00{text}".encode()).hexdigest()
+
+
+def _cache_embedding(key: str, embedding: list):
+    """写入嵌入缓存并按LRU淘汰"""
+    _embedding_cache[key] = embedding
+    if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+class CachedEmbedder(OpenAIEmbedder):
+    """带LRU缓存的嵌入模型：相同文本的向量只计算一次"""
+
+    def get_embedding(self, text: str) -> List[float]:
+        key = _embedding_cache_key(self.id, text)
+        cached = _embedding_cache.get(key)
+        if cached is not None:
+            # 命中后移到队尾，维持LRU顺序
+            _embedding_cache.move_to_end(key)
+            return cached
+
+        embedding = super().get_embedding(text)
+        _cache_embedding(key, embedding)
+        return embedding
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        批量获取嵌入向量
+
+        未命中缓存的文本按 EMBEDDING_BATCH（默认25，DashScope单次
+        上限）分批提交，N条文本的HTTP往返从N次降为N/批大小次。
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        misses = []
+        for i, text in enumerate(texts):
+            key = _embedding_cache_key(self.id, text)
+            cached = _embedding_cache.get(key)
+            if cached is not None:
+                _embedding_cache.move_to_end(key)
+                results[i] = cached
+            else:
+                misses.append(i)
+
+        batch_size = int(os.getenv("EMBEDDING_BATCH", "25"))
+        for start in range(0, len(misses), batch_size):
+            batch_indices = misses[start:start + batch_size]
+            batch_texts = [texts[i] for i in batch_indices]
+            try:
+                # 一次API调用嵌入整批文本
+                response = self.client.embeddings.create(
+                    input=batch_texts, model=self.id, dimensions=self.dimensions)
+                embeddings = [item.embedding for item in response.data]
+            except Exception as e:
+                # 批量接口不可用时退回逐条嵌入
+                logger.warning(f"批量嵌入失败，退回逐条嵌入: {e}")
+                single_embed = super().get_embedding
+                embeddings = [single_embed(text) for text in batch_texts]
+            for i, embedding in zip(batch_indices, embeddings):
+                results[i] = embedding
+                _cache_embedding(_embedding_cache_key(self.id, texts[i]), embedding)
+
+        return results
+
 
+@functools.lru_cache(maxsize=1)
 def get_knowledge_contents_db() -> MySQLDb:
     """
-    获取知识库内容数据库实例（MySQL）
+    获取知识库内容数据库实例（MySQL，进程内单例）
     
     用于存储知识库的元数据和内容信息
     
@@ -48,9 +133,10 @@ def get_knowledge_contents_db() -> MySQLDb:
     return contents_db
 
 
+@functools.lru_cache(maxsize=1)
 def get_knowledge_embedder() -> OpenAIEmbedder:
     """
-    获取知识库嵌入模型实例
+    获取知识库嵌入模型实例（进程内单例，带嵌入向量缓存）
     
     用于将文本转换为向量
     
@@ -73,21 +159,24 @@ def get_knowledge_embedder() -> OpenAIEmbedder:
     }
     dimensions = dimensions_map.get(model_id, 1536)  # 默认1536
     
-    # 创建 OpenAI 兼容的嵌入模型实例（用于DashScope）
-    embedder = OpenAIEmbedder(
+    # 创建 OpenAI 兼容的嵌入模型实例（用于DashScope，带LRU向量缓存，
+    # 复用共享的保活HTTP客户端）
+    embedder = CachedEmbedder(
         id=model_id,
         base_url=base_url,
         api_key=api_key,
         dimensions=dimensions,
+        client_params={"http_client": _shared_http_client},
     )
     
     logger.debug(f"创建嵌入模型: {model_id}, 维度: {dimensions}, API地址: {base_url}")
     return embedder
 
 
+@functools.lru_cache(maxsize=1)
 def get_knowledge_vector_db() -> Milvus:
     """
-    获取知识库向量数据库实例（Milvus）
+    获取知识库向量数据库实例（Milvus，进程内单例）
     
     用于存储知识库的向量数据
     
@@ -120,11 +209,14 @@ def get_knowledge_vector_db() -> Milvus:
     return vector_db
 
 
+@functools.lru_cache(maxsize=1)
 def create_knowledge() -> Knowledge:
     """
-    创建知识库实例
+    创建知识库实例（进程内单例）
     
-    配置了 Milvus 向量数据库和 MySQL 内容数据库
+    配置了 Milvus 向量数据库和 MySQL 内容数据库。构建过程会建立
+    Milvus 连接并确保默认集合存在，属于网络操作，因此结果用
+    lru_cache 缓存，每个进程只执行一次。
     
     Returns:
         Knowledge: 知识库实例
@@ -3,25 +3,59 @@ Main Application Entry Point
 主应用入口文件，基于 AgentOS 提供完整的 API 服务
 """
 
+import asyncio
+import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # 环境配置加载（日志系统已在start.py中初始化）
 from src.utils.config_loader import get_config_loader
 get_config_loader().load_config(auto_detect_ip=True, project_root=Path(__file__).parent.parent)
 
+logger = logging.getLogger(__name__)
+
+
+def _init_agentos(application: FastAPI):
+    """构建 AgentOS 实例并把其路由注册到应用上（在线程中执行）"""
+    from src.agentos import create_agentos
+    agent_os = create_agentos(base_app=application)
+    agent_os.get_app()  # 注册 AgentOS 路由
+    # AgentOS 路由在启动后才挂载，让 OpenAPI 模式重新生成
+    application.openapi_schema = None
+    return agent_os
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    应用生命周期管理
+
+    AgentOS 的构建会实例化全部智能体、团队和工作流（含模型与
+    数据库句柄），放到启动后的线程中执行：进程一起来就能响应
+    健康检查，冷启动不再被智能体构建阻塞。
+    """
+    application.state.agent_os = await asyncio.to_thread(_init_agentos, application)
+    logger.info("AgentOS 初始化完成")
+    yield
+
+
 # 创建 base_app 并注册自定义路由
-base_app = FastAPI(title="Agno Multi Agent Framework", description="Multi Agent Framework based on Agno", version="0.1.0")
+base_app = FastAPI(title="Agno Multi Agent Framework", description="Multi Agent Framework based on Agno", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 base_app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
 from src.api import api_router, root_router
 base_app.include_router(root_router)
 base_app.include_router(api_router)
 
-# 创建 AgentOS 实例并获取应用
-from src.agentos import create_agentos
-agent_os = create_agentos(base_app=base_app)
-app = agent_os.get_app()
+# AgentOS 在 lifespan 中延迟构建（见上），应用本体即 base_app
+app = base_app
+
+
+def get_agent_os():
+    """获取 AgentOS 实例（lifespan 启动完成后可用）"""
+    return getattr(app.state, 'agent_os', None)
 
@@ -4,10 +4,13 @@ Model Configuration Module
 """
 
 import os
+import functools
 import logging
-from typing import Optional
-from agno.models.deepseek import DeepSeek
-from agno.knowledge.embedder.openai import OpenAIEmbedder
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from agno.models.deepseek import DeepSeek
+    from agno.knowledge.embedder.openai import OpenAIEmbedder
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +19,10 @@ class ModelConfig:
     """模型配置类"""
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_chat_model_config() -> dict:
         """
-        获取聊天模型配置
+        获取聊天模型配置（首次调用解析环境变量后缓存）
 
         Returns:
             配置字典
@@ -30,9 +34,10 @@ class ModelConfig:
         }
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_embedding_model_config() -> dict:
         """
-        获取嵌入模型配置
+        获取嵌入模型配置（首次调用解析环境变量后缓存）
 
         Returns:
             配置字典
@@ -44,24 +49,17 @@ class ModelConfig:
         }
 
 
-def get_chat_model() -> DeepSeek:
-    """
-    获取聊天模型实例（DeepSeek私有部署）
+@functools.lru_cache(maxsize=4)
+def _build_chat_model(model_id: str, api_key: str, base_url: str) -> "DeepSeek":
+    """按配置签名构建并缓存聊天模型实例（同配置只初始化一次HTTP客户端）"""
+    # 延迟导入：agno 模型模块的传递依赖较重，推迟到首次创建模型时加载
+    from agno.models.deepseek import DeepSeek
 
-    Returns:
-        DeepSeek 模型实例
-    """
-    config = ModelConfig.get_chat_model_config()
-    
-    api_key = config["api_key"]
-    base_url = config["base_url"]
-    model_id = config["model_id"]
-    
     if not api_key:
         logger.warning("未配置 MODEL_API_KEY，使用默认值")
-    
-    logger.debug(f"初始化DeepSeek聊天模型: {model_id}, API地址: {base_url}")
-    
+
+    logger.debug("初始化DeepSeek聊天模型: %s, API地址: %s", model_id, base_url)
+
     # 创建DeepSeek模型实例
     # 如果提供了base_url，使用base_url参数（私有部署）
     if base_url and base_url != "https://api.deepseek.com":
@@ -76,28 +74,32 @@ def get_chat_model() -> DeepSeek:
             id=model_id,
             api_key=api_key,
         )
-    
+
     return model
 
 
-def get_embedding_model() -> OpenAIEmbedder:
+def get_chat_model() -> "DeepSeek":
     """
-    获取嵌入模型实例（阿里云DashScope）
+    获取聊天模型实例（DeepSeek私有部署，按配置签名缓存的进程内单例）
 
     Returns:
-        OpenAIEmbedder 模型实例
+        DeepSeek 模型实例
     """
-    config = ModelConfig.get_embedding_model_config()
-    
-    api_key = config["api_key"]
-    base_url = config["base_url"]
-    model_id = config["model_id"]
-    
+    config = ModelConfig.get_chat_model_config()
+    return _build_chat_model(config["model_id"], config["api_key"], config["base_url"])
+
+
+@functools.lru_cache(maxsize=4)
+def _build_embedding_model(model_id: str, api_key: str, base_url: str) -> "OpenAIEmbedder":
+    """按配置签名构建并缓存嵌入模型实例"""
+    # 延迟导入：仅在真正构建嵌入模型时加载 openai 相关依赖
+    from agno.knowledge.embedder.openai import OpenAIEmbedder
+
     if not api_key:
         logger.warning("未配置 EMBEDDING_API_KEY，使用默认值")
-    
-    logger.debug(f"初始化嵌入模型: {model_id}, API地址: {base_url}")
-    
+
+    logger.debug("初始化嵌入模型: %s, API地址: %s", model_id, base_url)
+
     # 创建OpenAI兼容的嵌入模型实例（用于DashScope）
     # OpenAIEmbedder支持base_url参数用于自定义API端点
     model = OpenAIEmbedder(
@@ -105,10 +107,29 @@ def get_embedding_model() -> OpenAIEmbedder:
         api_key=api_key,
         base_url=base_url,
     )
-    
+
     return model
 
 
+def get_embedding_model() -> "OpenAIEmbedder":
+    """
+    获取嵌入模型实例（阿里云DashScope，按配置签名缓存的进程内单例）
+
+    Returns:
+        OpenAIEmbedder 模型实例
+    """
+    config = ModelConfig.get_embedding_model_config()
+    return _build_embedding_model(config["model_id"], config["api_key"], config["base_url"])
+
+
+def reset_models():
+    """清空模型实例与配置缓存（主要供测试或配置热更新后使用）"""
+    _build_chat_model.cache_clear()
+    _build_embedding_model.cache_clear()
+    ModelConfig.get_chat_model_config.cache_clear()
+    ModelConfig.get_embedding_model_config.cache_clear()
+
+
 class EmbeddingModelConfig:
     """嵌入模型配置类（别名，保持兼容性）"""
     
@@ -7,13 +7,116 @@ import os
 import sys
 import socket
 import platform
+import functools
+import importlib.util
+import ipaddress
 import logging
+import pprint
+import tempfile
+from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Any
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 
 logger = logging.getLogger(__name__)
 
+# 项目根目录只解析一次（此文件位于 src/utils/ 下）
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 平台检测在模块加载时做一次（platform.system 在部分平台会触发 uname 系统调用）
+_PLATFORM = platform.system().lower()
+
+# 合法的环境类型集合（O(1)成员检测，避免每次调用构建列表字面量）
+_VALID_ENVS = frozenset({'dev', 'show', 'prod'})
+
+
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """
+    应用配置快照 - 启动时解析一次的不可变配置对象
+
+    在 load_config 加载完环境变量后构建，之后热路径通过属性访问
+    读取配置，不再反复调用 os.getenv 和 int() 解析。
+    """
+    APP_ENV: str
+    APP_HOST: str
+    APP_PORT: int
+    APP_ENV_TYPE: str
+    # Agno专用数据库配置
+    AGNO_MYSQL_HOST: str
+    AGNO_MYSQL_PORT: int
+    AGNO_MYSQL_USER: str
+    AGNO_MYSQL_DB_SCHEMA: str
+    # 业务数据库配置
+    BUSINESS_MYSQL_HOST: str
+    BUSINESS_MYSQL_PORT: int
+    BUSINESS_MYSQL_USER: str
+    BUSINESS_MYSQL_DATABASES: str
+    # Agno数据库表名配置
+    WORKFLOW_SESSION_TABLE: str
+    TEAM_SESSION_TABLE: str
+    AGENT_SESSION_TABLE: str
+    AGNO_MEMORY_TABLE: str
+    AGNO_TRACES_TABLE: str
+    AGNO_SPANS_TABLE: str
+    AGNO_METRICS_TABLE: str
+    AGNO_EVAL_TABLE: str
+    AGNO_KNOWLEDGE_TABLE: str
+    AGNO_CULTURE_TABLE: str
+    LOG_LEVEL: str
+
+
+def _build_app_config() -> AppConfig:
+    """从当前环境变量解析并构建不可变配置对象"""
+    # 一次快照环境变量字典，用 pick 按优先级取第一个存在的键，
+    # 避免 os.getenv(A, os.getenv(B, ...)) 这类无条件求值的嵌套回退链
+    env = os.environ
+
+    def pick(*keys: str, default: str = '') -> str:
+        for key in keys:
+            value = env.get(key)
+            if value is not None:
+                return value
+        return default
+
+    return AppConfig(
+        APP_ENV=pick('APP_ENV', default='development'),
+        APP_HOST=pick('APP_HOST', default='0.0.0.0'),
+        APP_PORT=int(pick('APP_PORT', default='8000')),
+        APP_ENV_TYPE=pick('APP_ENV_TYPE', default='dev'),
+        AGNO_MYSQL_HOST=pick('AGNO_MYSQL_HOST', 'MYSQL_HOST', default='localhost'),
+        AGNO_MYSQL_PORT=int(pick('AGNO_MYSQL_PORT', 'MYSQL_PORT', default='3306')),
+        AGNO_MYSQL_USER=pick('AGNO_MYSQL_USER', 'MYSQL_USER', default='root'),
+        AGNO_MYSQL_DB_SCHEMA=pick('AGNO_MYSQL_DB_SCHEMA', 'AGNO_MYSQL_DATABASE', 'MYSQL_DATABASE', default='agno_backend'),
+        BUSINESS_MYSQL_HOST=pick('BUSINESS_MYSQL_HOST', 'MYSQL_HOST', default='localhost'),
+        BUSINESS_MYSQL_PORT=int(pick('BUSINESS_MYSQL_PORT', 'MYSQL_PORT', default='3306')),
+        BUSINESS_MYSQL_USER=pick('BUSINESS_MYSQL_USER', 'MYSQL_USER', default='root'),
+        BUSINESS_MYSQL_DATABASES=pick('BUSINESS_MYSQL_DATABASES'),
+        WORKFLOW_SESSION_TABLE=pick('WORKFLOW_SESSION_TABLE', default='workflow_sessions'),
+        TEAM_SESSION_TABLE=pick('TEAM_SESSION_TABLE', default='team_sessions'),
+        AGENT_SESSION_TABLE=pick('AGENT_SESSION_TABLE', default='agent_sessions'),
+        AGNO_MEMORY_TABLE=pick('AGNO_MEMORY_TABLE', default='agno_tags_memories'),
+        AGNO_TRACES_TABLE=pick('AGNO_TRACES_TABLE', default='agno_tags_traces'),
+        AGNO_SPANS_TABLE=pick('AGNO_SPANS_TABLE', default='agno_tags_spans'),
+        AGNO_METRICS_TABLE=pick('AGNO_METRICS_TABLE', default='agno_tags_metrics'),
+        AGNO_EVAL_TABLE=pick('AGNO_EVAL_TABLE', default='agno_tags_evaluations'),
+        AGNO_KNOWLEDGE_TABLE=pick('AGNO_KNOWLEDGE_TABLE', default='agno_tags_knowledge'),
+        AGNO_CULTURE_TABLE=pick('AGNO_CULTURE_TABLE', default='agno_tags_culture'),
+        LOG_LEVEL=pick('LOG_LEVEL', default='INFO'),
+    )
+
+
+# 全局配置快照（load_config 成功后填充）
+_app_config: Optional[AppConfig] = None
+
+
+def get_app_config() -> AppConfig:
+    """获取应用配置快照（load_config 未执行过时按当前环境变量构建）"""
+    global _app_config
+    if _app_config is None:
+        _app_config = _build_app_config()
+    return _app_config
+
 
 class ConfigLoader:
     """配置加载器 - 支持从环境变量、文件、IP自动检测等多种方式加载配置"""
@@ -21,6 +124,8 @@ class ConfigLoader:
     def __init__(self):
         """初始化配置加载器，加载IP映射配置"""
         self._load_ip_mapping()
+        # IP环境检测结果缓存：检测涉及socket系统调用，结果在进程内不会变化
+        self._detected_env: Optional[str] = None
     
     def _load_ip_mapping(self):
         """从配置文件加载IP映射（使用列表方式，参考 env_loader.py）"""
@@ -36,46 +141,57 @@ class ConfigLoader:
             
             if hasattr(mapping_module, 'PROD_LIST'):
                 self.PROD_LIST = mapping_module.PROD_LIST
-                logger.debug(f"从配置文件加载生产服务器列表: {len(self.PROD_LIST)} 个IP")
+                logger.debug("从配置文件加载生产服务器列表: %s 个IP", len(self.PROD_LIST))
             
             if hasattr(mapping_module, 'PREVIEW_LIST'):
                 self.PREVIEW_LIST = mapping_module.PREVIEW_LIST
-                logger.debug(f"从配置文件加载预演服务器列表: {len(self.PREVIEW_LIST)} 个IP")
+                logger.debug("从配置文件加载预演服务器列表: %s 个IP", len(self.PREVIEW_LIST))
             
             if hasattr(mapping_module, 'DEV_LIST'):
                 self.DEV_LIST = mapping_module.DEV_LIST
-                logger.debug(f"从配置文件加载开发服务器列表: {len(self.DEV_LIST)} 个IP")
+                logger.debug("从配置文件加载开发服务器列表: %s 个IP", len(self.DEV_LIST))
         except Exception as e:
-            logger.warning(f"加载IP映射配置失败，使用默认配置: {e}")
+            logger.warning("加载IP映射配置失败，使用默认配置: %s", e)
+
+        # 构建哈希集合用于O(1)成员检测；列表仅保留给 add_xxx_ip 动态追加使用
+        self.PROD_SET = frozenset(self.PROD_LIST)
+        self.PREVIEW_SET = frozenset(self.PREVIEW_LIST)
+        self.DEV_SET = frozenset(self.DEV_LIST)
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_local_ip() -> Optional[str]:
         """
         跨平台获取本地 IP 地址（参考 env_loader.py 的实现）
-        - Linux: 优先尝试 eth0（云服务器内网 IP），失败则回退到 socket.connect
-        - Windows/macOS: 使用 socket.connect 获取默认出口 IP
-        
+        - 优先通过主机名解析（getaddrinfo）获取非回环地址，
+          不依赖具体网卡名（eth0/ens5/eno1 等均适用）
+        - 失败则回退到 socket.connect 获取默认出口 IP
+
+        首次调用后结果缓存在进程内（lru_cache），后续调用不再触发
+        socket 系统调用；需要重新探测时调用 ConfigLoader.refresh()。
+
         Returns:
             本机IP地址字符串，如果获取失败返回 "127.0.0.1"
         """
-        system = platform.system().lower()
-        
-        if system == "linux":
-            # 尝试直接读取 eth0（适用于云服务器）
+        # 运维可通过 LOCAL_IP 直接指定本机IP，合法IP字面量时跳过socket探测
+        local_ip = os.environ.get("LOCAL_IP")
+        if local_ip:
             try:
-                import fcntl
-                import struct
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                ip = socket.inet_ntoa(fcntl.ioctl(
-                    s.fileno(),
-                    0x8915,  # SIOCGIFADDR，用于"获取接口地址"
-                    struct.pack('256s', b'eth0')
-                )[20:24])
-                logger.debug(f"[Linux] 通过 eth0 获取内网 IP: {ip}")
-                s.close()
-                return ip
-            except Exception as e:
-                logger.debug(f"读取 eth0 失败，回退到通用方法: {e}")
+                ipaddress.ip_address(local_ip)
+                logger.debug("使用环境变量 LOCAL_IP 指定的本机IP: %s", local_ip)
+                return local_ip
+            except ValueError:
+                logger.warning("环境变量 LOCAL_IP 不是合法IP地址，回退到自动探测: %s", local_ip)
+
+        # 优先通过主机名解析获取非回环地址（单次解析调用，不绑定网卡名）
+        try:
+            for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+                ip = info[4][0]
+                if not ip.startswith("127."):
+                    logger.debug("通过主机名解析获取本机 IP: %s", ip)
+                    return ip
+        except Exception as e:
+            logger.debug("主机名解析失败，回退到通用方法: %s", e)
         
         # 通用方法：适用于 Windows / macOS / Linux 回退
         try:
@@ -84,10 +200,10 @@ class ConfigLoader:
             s.connect(("8.8.8.8", 80))
             ip = s.getsockname()[0]
             s.close()
-            logger.debug(f"[{system}] 通过 socket.connect 获取 IP: {ip}")
+            logger.debug("[%s] 通过 socket.connect 获取 IP: %s", _PLATFORM, ip)
             return ip
         except Exception as e:
-            logger.error(f"获取本地 IP 失败: {e}")
+            logger.error("获取本地 IP 失败: %s", e)
             return "127.0.0.1"
     
     def detect_env_by_ip(self, ip: Optional[str] = None) -> Optional[str]:
@@ -100,28 +216,41 @@ class ConfigLoader:
         Returns:
             环境类型字符串 (dev/show/prod)，如果无法检测返回None
         """
-        if ip is None:
+        auto_detect = ip is None
+        if auto_detect:
+            # 环境类型已由外部指定时无需任何IP探测
+            env_type = os.getenv('APP_ENV_TYPE')
+            if env_type:
+                logger.debug("环境变量 APP_ENV_TYPE 已指定环境类型，跳过IP检测: %s", env_type)
+                return env_type
+
+            # 自动检测路径结果稳定，直接复用首次检测的缓存
+            if self._detected_env is not None:
+                return self._detected_env
             ip = ConfigLoader.get_local_ip()
-        
+
         if ip is None:
             logger.warning("无法获取本机IP地址，跳过IP环境检测")
             return None
-        
-        logger.debug(f"检测到本机IP: {ip}")
-        
-        # 检查生产服务器列表
-        if ip in self.PROD_LIST:
-            logger.debug(f"当前IP地址 {ip} 在生产服务器列表中，加载生产环境配置")
-            return "prod"
-        
-        # 检查预演服务器列表
-        if ip in self.PREVIEW_LIST:
-            logger.debug(f"当前IP地址 {ip} 在预演服务器列表中，加载预演环境配置")
-            return "show"
-        
-        # 其他IP默认使用开发环境（包括 127.0.0.1）
-        logger.debug(f"当前IP地址 {ip} 未在生产或预演服务器列表中，加载开发环境配置")
-        return "dev"
+
+        logger.debug("检测到本机IP: %s", ip)
+
+        # 检查生产服务器集合（frozenset哈希查找，O(1)）
+        if ip in self.PROD_SET:
+            logger.debug("当前IP地址 %s 在生产服务器列表中，加载生产环境配置", ip)
+            env = "prod"
+        elif ip in self.PREVIEW_SET:
+            # 检查预演服务器集合
+            logger.debug("当前IP地址 %s 在预演服务器列表中，加载预演环境配置", ip)
+            env = "show"
+        else:
+            # 其他IP默认使用开发环境（包括 127.0.0.1）
+            logger.debug("当前IP地址 %s 未在生产或预演服务器列表中，加载开发环境配置", ip)
+            env = "dev"
+
+        if auto_detect:
+            self._detected_env = env
+        return env
     
     @staticmethod
     def load_from_env_file(env_file: Path) -> bool:
@@ -138,30 +267,79 @@ class ConfigLoader:
             return False
         
         load_dotenv(env_file, override=True)
-        logger.debug(f"从文件加载配置: {env_file}")
+        logger.debug("从文件加载配置: %s", env_file)
         return True
     
+    @staticmethod
+    def load_from_env_compiled(env_file: Path) -> bool:
+        """
+        加载环境变量文件，带"编译"侧车缓存
+
+        dotenv 的正则解析在每次启动都要重跑。首次解析后把结果写成
+        `<env_file>.py`（内容为 `ENV = {...}` 字典），后续启动直接
+        import 该侧车——Python 的 .pyc 字节码缓存使其接近零解析成本。
+        侧车比源文件旧时自动重新解析并刷新。
+
+        Args:
+            env_file: 环境变量文件路径
+
+        Returns:
+            是否成功加载
+        """
+        if not env_file.exists():
+            return False
+
+        compiled_file = env_file.with_name(env_file.name + '.py')
+
+        # 热路径：侧车存在且不旧于源文件时直接 import
+        if compiled_file.exists() and compiled_file.stat().st_mtime >= env_file.stat().st_mtime:
+            try:
+                spec = importlib.util.spec_from_file_location(
+                    f"_env_compiled_{env_file.stem}", compiled_file)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                os.environ.update(module.ENV)
+                logger.debug("从编译缓存加载配置: %s", compiled_file.name)
+                return True
+            except Exception as e:
+                logger.debug("加载配置编译缓存失败，回退到dotenv解析: %s", e)
+
+        # 冷路径：dotenv 解析后写出侧车供下次启动使用
+        values = {k: v for k, v in dotenv_values(env_file).items() if v is not None}
+        os.environ.update(values)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=env_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write("# 自动生成的配置缓存，请勿手工编辑（修改源文件后自动刷新）\n")
+                f.write(f"ENV = {pprint.pformat(values)}\n")
+            os.replace(tmp_path, compiled_file)
+        except Exception as e:
+            logger.debug("写入配置编译缓存失败（忽略）: %s", e)
+
+        logger.debug("从文件加载配置: %s", env_file)
+        return True
+
     @staticmethod
     def load_from_env_type(env_type: str, project_root: Optional[Path] = None) -> bool:
         """
         根据环境类型加载对应的配置文件
-        
+
         Args:
             env_type: 环境类型 (dev/show/prod)
             project_root: 项目根目录，如果为None则自动检测
-            
+
         Returns:
             是否成功加载
         """
         if project_root is None:
-            project_root = Path(__file__).parent.parent.parent
-        
+            project_root = _PROJECT_ROOT
+
         # 优先尝试 .env.{env_type}，如果不存在则尝试 env.{env_type}
         env_file = project_root / f'.env.{env_type}'
         if not env_file.exists():
             env_file = project_root / f'env.{env_type}'
-        
-        return ConfigLoader.load_from_env_file(env_file)
+
+        return ConfigLoader.load_from_env_compiled(env_file)
     
     def load_config(
         self,
@@ -188,39 +366,41 @@ class ConfigLoader:
         Returns:
             实际使用的环境类型字符串
         """
+        global _app_config
+
         if project_root is None:
-            project_root = Path(__file__).parent.parent.parent
+            project_root = _PROJECT_ROOT
         
         detected_env = None
         
         # 优先级1: 命令行参数
         if len(sys.argv) > 1:
             arg = sys.argv[1]
-            if arg in ['dev', 'show', 'prod']:
+            if arg in _VALID_ENVS:
                 detected_env = arg
-                logger.debug(f"从命令行参数获取环境类型: {detected_env}")
+                logger.debug("从命令行参数获取环境类型: %s", detected_env)
         
         # 优先级2: 直接传入的 env_type 参数
         if not detected_env and env_type:
             detected_env = env_type
-            logger.debug(f"从参数获取环境类型: {detected_env}")
+            logger.debug("从参数获取环境类型: %s", detected_env)
         
         # 优先级3: 环境变量
         if not detected_env:
             detected_env = os.getenv('APP_ENV_TYPE')
             if detected_env:
-                logger.debug(f"从环境变量 APP_ENV_TYPE 获取环境类型: {detected_env}")
+                logger.debug("从环境变量 APP_ENV_TYPE 获取环境类型: %s", detected_env)
         
         # 优先级4: IP自动检测
         if not detected_env and auto_detect_ip:
             detected_env = self.detect_env_by_ip()
             if detected_env:
-                logger.debug(f"通过IP自动检测获取环境类型: {detected_env}")
+                logger.debug("通过IP自动检测获取环境类型: %s", detected_env)
         
         # 优先级5: 默认值
         if not detected_env:
             detected_env = 'dev'
-            logger.debug(f"使用默认环境类型: {detected_env}")
+            logger.debug("使用默认环境类型: %s", detected_env)
         
         # 如果指定了配置文件，直接加载
         if config_file:
@@ -229,65 +409,66 @@ class ConfigLoader:
                 ConfigLoader.load_from_env_file(config_path)
             else:
                 ConfigLoader.load_from_env_file(project_root / config_path)
-            logger.debug(f"从指定配置文件加载: {config_file}")
+            logger.debug("从指定配置文件加载: %s", config_file)
+            os.environ['APP_ENV_TYPE'] = detected_env
+            _app_config = _build_app_config()
             return detected_env
         
+        # 扫描一次项目根目录拿到全部文件名，后续用集合查找代替逐个
+        # Path.exists() 探测（每次 exists 都是一个 stat 系统调用）
+        try:
+            with os.scandir(project_root) as entries:
+                root_files = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            root_files = set()
+
         # 优先级1: 加载本地覆盖文件 .env（如果存在）
-        local_env_file = project_root / '.env'
-        if local_env_file.exists():
-            ConfigLoader.load_from_env_file(local_env_file)
+        if '.env' in root_files:
+            ConfigLoader.load_from_env_file(project_root / '.env')
             logger.debug("已加载本地覆盖配置: .env")
         else:
-            # 优先级2: 加载环境特定的配置文件
-            if ConfigLoader.load_from_env_type(detected_env, project_root):
-                logger.debug(f"已加载环境配置: .env.{detected_env}")
+            # 优先级2: 加载环境特定的配置文件（.env.{type} 优先于 env.{type}）
+            env_file_name = None
+            if f'.env.{detected_env}' in root_files:
+                env_file_name = f'.env.{detected_env}'
+            elif f'env.{detected_env}' in root_files:
+                env_file_name = f'env.{detected_env}'
+
+            if env_file_name and ConfigLoader.load_from_env_compiled(project_root / env_file_name):
+                logger.debug("已加载环境配置: %s", env_file_name)
             else:
                 # 优先级3: 从系统环境变量加载
                 load_dotenv()
-                logger.warning(f"未找到 .env.{detected_env} 文件，使用系统环境变量")
+                logger.warning("未找到 .env.%s 文件，使用系统环境变量", detected_env)
         
         # 设置环境变量，供其他模块使用
         os.environ['APP_ENV_TYPE'] = detected_env
-        
+
+        # 环境变量就绪后构建不可变配置快照，供热路径按属性读取
+        _app_config = _build_app_config()
+
         return detected_env
     
     @staticmethod
     def get_config_dict() -> Dict[str, Any]:
         """
-        获取当前所有配置的字典形式
-        
+        获取当前所有配置的字典形式（来自启动时构建的配置快照）
+
         Returns:
             配置字典
         """
-        return {
-            'APP_ENV': os.getenv('APP_ENV', 'development'),
-            'APP_HOST': os.getenv('APP_HOST', '0.0.0.0'),
-            'APP_PORT': int(os.getenv('APP_PORT', '8000')),
-            'APP_ENV_TYPE': os.getenv('APP_ENV_TYPE', 'dev'),
-            # Agno专用数据库配置
-            'AGNO_MYSQL_HOST': os.getenv('AGNO_MYSQL_HOST', os.getenv('MYSQL_HOST', 'localhost')),
-            'AGNO_MYSQL_PORT': int(os.getenv('AGNO_MYSQL_PORT', os.getenv('MYSQL_PORT', '3306'))),
-            'AGNO_MYSQL_USER': os.getenv('AGNO_MYSQL_USER', os.getenv('MYSQL_USER', 'root')),
-            'AGNO_MYSQL_DB_SCHEMA': os.getenv('AGNO_MYSQL_DB_SCHEMA', os.getenv('AGNO_MYSQL_DATABASE', os.getenv('MYSQL_DATABASE', 'agno_backend'))),
-            # 业务数据库配置
-            'BUSINESS_MYSQL_HOST': os.getenv('BUSINESS_MYSQL_HOST', os.getenv('MYSQL_HOST', 'localhost')),
-            'BUSINESS_MYSQL_PORT': int(os.getenv('BUSINESS_MYSQL_PORT', os.getenv('MYSQL_PORT', '3306'))),
-            'BUSINESS_MYSQL_USER': os.getenv('BUSINESS_MYSQL_USER', os.getenv('MYSQL_USER', 'root')),
-            'BUSINESS_MYSQL_DATABASES': os.getenv('BUSINESS_MYSQL_DATABASES', ''),
-            # Agno数据库表名配置
-            'WORKFLOW_SESSION_TABLE': os.getenv('WORKFLOW_SESSION_TABLE', 'workflow_sessions'),
-            'TEAM_SESSION_TABLE': os.getenv('TEAM_SESSION_TABLE', 'team_sessions'),
-            'AGENT_SESSION_TABLE': os.getenv('AGENT_SESSION_TABLE', 'agent_sessions'),
-            'AGNO_MEMORY_TABLE': os.getenv('AGNO_MEMORY_TABLE', 'agno_tags_memories'),
-            'AGNO_TRACES_TABLE': os.getenv('AGNO_TRACES_TABLE', 'agno_tags_traces'),
-            'AGNO_SPANS_TABLE': os.getenv('AGNO_SPANS_TABLE', 'agno_tags_spans'),
-            'AGNO_METRICS_TABLE': os.getenv('AGNO_METRICS_TABLE', 'agno_tags_metrics'),
-            'AGNO_EVAL_TABLE': os.getenv('AGNO_EVAL_TABLE', 'agno_tags_evaluations'),
-            'AGNO_KNOWLEDGE_TABLE': os.getenv('AGNO_KNOWLEDGE_TABLE', 'agno_tags_knowledge'),
-            'AGNO_CULTURE_TABLE': os.getenv('AGNO_CULTURE_TABLE', 'agno_tags_culture'),
-            'LOG_LEVEL': os.getenv('LOG_LEVEL', 'INFO'),
-        }
+        return asdict(get_app_config())
     
+    def refresh(self):
+        """
+        清空IP检测缓存，下次调用时重新探测
+
+        用于IP映射配置或网络环境发生变化后显式失效缓存
+        """
+        self._detected_env = None
+        ConfigLoader.get_local_ip.cache_clear()
+        logger.debug("已清空IP环境检测缓存")
+
     def add_prod_ip(self, ip: str):
         """
         动态添加生产服务器IP
@@ -295,9 +476,10 @@ class ConfigLoader:
         Args:
             ip: IP地址
         """
-        if ip not in self.PROD_LIST:
+        if ip not in self.PROD_SET:
             self.PROD_LIST.append(ip)
-            logger.debug(f"添加生产服务器IP: {ip}")
+            self.PROD_SET = frozenset(self.PROD_LIST)
+            logger.debug("添加生产服务器IP: %s", ip)
     
     def add_preview_ip(self, ip: str):
         """
@@ -306,9 +488,10 @@ class ConfigLoader:
         Args:
             ip: IP地址
         """
-        if ip not in self.PREVIEW_LIST:
+        if ip not in self.PREVIEW_SET:
             self.PREVIEW_LIST.append(ip)
-            logger.debug(f"添加预演服务器IP: {ip}")
+            self.PREVIEW_SET = frozenset(self.PREVIEW_LIST)
+            logger.debug("添加预演服务器IP: %s", ip)
     
     def add_dev_ip(self, ip: str):
         """
@@ -317,9 +500,10 @@ class ConfigLoader:
         Args:
             ip: IP地址
         """
-        if ip not in self.DEV_LIST:
+        if ip not in self.DEV_SET:
             self.DEV_LIST.append(ip)
-            logger.debug(f"添加开发服务器IP: {ip}")
+            self.DEV_SET = frozenset(self.DEV_LIST)
+            logger.debug("添加开发服务器IP: %s", ip)
 
 
 # 全局配置加载器实例（延迟初始化）
@@ -4,12 +4,16 @@
 """
 
 import os
+import atexit
 import logging
 import logging.handlers
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# 项目根目录只解析一次（此文件位于 src/utils/ 下）
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
 
 def setup_logging(
     project_root: Optional[Path] = None,
@@ -28,7 +32,7 @@ def setup_logging(
     """
     if project_root is None:
         # 自动检测项目根目录（假设此文件在 src/utils/ 下）
-        project_root = Path(__file__).parent.parent.parent
+        project_root = _PROJECT_ROOT
     
     # 获取日志级别
     if log_level is None:
@@ -56,18 +60,31 @@ def setup_logging(
     # 清除已有的处理器
     root_logger.handlers.clear()
     
-    # 文件日志处理器
+    # 文件日志处理器：滚动文件 + 内存缓冲
+    # MemoryHandler 把日志先积攒在内存里（ERROR及以上立即刷出），
+    # 批量写入时一次系统调用覆盖多条记录，避免每条debug日志一次write；
+    # RotatingFileHandler 防止单个日志文件无限增长
     if log_to_file:
-        file_handler = logging.FileHandler(
+        file_handler = logging.handlers.RotatingFileHandler(
             log_file,
-            mode='w',
+            maxBytes=50_000_000,
+            backupCount=3,
             encoding='utf-8'
         )
         file_handler.setLevel(numeric_level)
         file_formatter = logging.Formatter(log_format, date_format)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
-        
+
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=256,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        memory_handler.setLevel(numeric_level)
+        root_logger.addHandler(memory_handler)
+        # 进程退出时刷出缓冲中剩余的日志
+        atexit.register(memory_handler.flush)
+
         # 同时记录日志文件路径
         print(f"日志文件: {log_file}")
     
@@ -8,40 +8,108 @@ YAML Agent Loader
 - 如需启用 YAML 配置加载，请在 `src/agentos/__init__.py` 中恢复相关代码
 """
 
-import yaml
 import os
+import functools
+import hashlib
+import importlib
+import orjson
+import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from agno.agent import Agent
-from src.models.model_config import get_chat_model
-from src.database.connection import get_agent_database
-from src.engine.tools.database_tools import database_tools
+from typing import Callable, Dict, Any, Optional, List, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    from agno.agent import Agent
+
 logger = logging.getLogger(__name__)
 
-# 工具名称映射
-TOOL_MAPPING = {
-    "database_tools": database_tools,
-    "database_query_tool": database_tools,
+# 项目根目录只解析一次（此文件位于 src/utils/ 下）
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_yaml_loader():
+    """获取YAML加载器（优先C实现的libyaml，比纯Python的SafeLoader快数倍）"""
+    import yaml
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=None)
+def _lazy(module_name: str, attr: str) -> List[Any]:
+    """按需导入模块属性并缓存，统一归一化为列表（工具模块只在YAML真正引用时才加载）"""
+    value = getattr(importlib.import_module(module_name), attr)
+    return value if isinstance(value, list) else [value]
+
+
+# 工具名称映射：值为零参工厂，首次调用时才导入对应的工具模块；
+# 工厂统一返回列表，派发循环只需一次 extend，无需逐项判断类型
+TOOL_MAPPING: Dict[str, Callable[[], List[Any]]] = {
+    "database_tools": lambda: _lazy("src.engine.tools.database_tools", "database_tools"),
+    "database_query_tool": lambda: _lazy("src.engine.tools.database_tools", "database_tools"),
     # 可以添加更多工具映射
 }
 
 
+def _yaml_cache_path(full_path: Path, stat: os.stat_result) -> Path:
+    """计算解析缓存文件路径（按路径+mtime+大小哈希命名，内容变化即失效）"""
+    digest = hashlib.sha256(
+        f"{full_path}\x00{stat.st_mtime_ns}\x00{stat.st_size}".encode()
+    ).hexdigest()
+    return Path(tempfile.gettempdir()) / f"agno_yaml_{digest}.json"
+
+
+def _load_yaml_cached(full_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    解析YAML文件，结果按(路径, mtime, 大小)做JSON缓存
+
+    PyYAML的纯Python解析器较慢；agents.yaml 是纯数据配置，首次解析后
+    用 orjson 序列化缓存，热启动时走 orjson 的原生反序列化（比重新
+    解析YAML快一个数量级），跳过整个tokenize/parse流程。缓存读写
+    失败时静默回退到直接解析。
+    """
+    stat = full_path.stat()
+    cache_path = _yaml_cache_path(full_path, stat)
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            logger.debug("读取YAML解析缓存失败，重新解析: %s", e)
+
+    yaml, loader = _get_yaml_loader()
+    with open(full_path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=loader)
+
+    try:
+        # 先写临时文件再原子替换，避免并发启动时读到半截缓存
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.debug("写入YAML解析缓存失败（忽略）: %s", e)
+
+    return config
+
+
 def create_agent_from_yaml_config(
     agent_config: Dict[str, Any],
     agent_name: str
-) -> Agent:
+) -> "Agent":
     """
     从 YAML 配置创建 Agent
-    
+
     Args:
         agent_config: YAML 中的 Agent 配置字典
         agent_name: Agent 名称
-    
+
     Returns:
         Agent 实例
     """
+    # 延迟导入：此模块当前未使用，不应在导入阶段拖入 agno/模型依赖
+    from agno.agent import Agent
+    from src.models.model_config import get_chat_model
+
     # 获取模型（始终使用项目配置的模型）
     model = get_chat_model()
     
@@ -55,14 +123,12 @@ def create_agent_from_yaml_config(
         tool_names = agent_config["tools"]
         if isinstance(tool_names, list):
             for tool_name in tool_names:
-                if tool_name in TOOL_MAPPING:
-                    tool_list = TOOL_MAPPING[tool_name]
-                    if isinstance(tool_list, list):
-                        tools.extend(tool_list)
-                    else:
-                        tools.append(tool_list)
+                factory = TOOL_MAPPING.get(tool_name)
+                if factory is not None:
+                    # 工厂恒定返回列表，直接 extend
+                    tools.extend(factory())
                 else:
-                    logger.warning(f"未找到工具映射: {tool_name}")
+                    logger.warning("未找到工具映射: %s", tool_name)
     
     # 构建 Agent 参数
     agent_kwargs = {
@@ -86,20 +152,21 @@ def create_agent_from_yaml_config(
         # 兼容旧的 enable_memory 配置
         agent_kwargs["enable_agentic_memory"] = True
     
-    # 添加数据库配置（如果指定）
+    # 添加数据库配置（如果指定，按需导入数据库连接模块）
     if agent_config.get("use_database", False):
+        from src.database.connection import get_agent_database
         agent_kwargs["db"] = get_agent_database()
     
     # 创建 Agent
     agent = Agent(**agent_kwargs)
     
-    logger.debug(f"从 YAML 创建 Agent '{name}'，使用模型: {model.id}")
+    logger.debug("从 YAML 创建 Agent '%s'，使用模型: %s", name, model.id)
     return agent
 
 
 def load_agents_from_yaml(
     yaml_path: str = "config/agents.yaml"
-) -> List[Agent]:
+) -> List["Agent"]:
     """
     从 YAML 文件加载并创建所有 Agent
     
@@ -109,18 +176,16 @@ def load_agents_from_yaml(
     Returns:
         Agent 列表
     """
-    project_root = Path(__file__).parent.parent.parent
-    full_path = project_root / yaml_path
+    full_path = _PROJECT_ROOT / yaml_path
     
     if not full_path.exists():
-        logger.warning(f"YAML 配置文件不存在: {yaml_path}，使用空列表")
+        logger.warning("YAML 配置文件不存在: %s，使用空列表", yaml_path)
         return []
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    
+    config = _load_yaml_cached(full_path)
+
     if not config or 'agents' not in config:
-        logger.warning(f"YAML 配置文件中没有 agents 配置")
+        logger.warning("YAML 配置文件中没有 agents 配置")
         return []
     
     agents = []
@@ -132,9 +197,9 @@ def load_agents_from_yaml(
             )
             agents.append(agent)
         except Exception as e:
-            logger.error(f"创建 Agent '{agent_name}' 失败: {e}", exc_info=True)
+            logger.error("创建 Agent '%s' 失败: %s", agent_name, e, exc_info=True)
             continue
     
-    logger.debug(f"从 YAML 成功创建 {len(agents)} 个 Agent")
+    logger.debug("从 YAML 成功创建 %s 个 Agent", len(agents))
     return agents
 
@@ -3,23 +3,37 @@ Milvus Vector Database Connection Module
 Milvus 向量数据库连接管理模块
 """
 
+import itertools
 import os
+import time
 from typing import Optional
 from pymilvus import connections, Collection, utility, db
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 健康检查结果缓存时长（秒）：探活调用可能非常频繁，TTL内直接复用上次结果
+_HEALTH_CHECK_TTL = 5.0
+
+# gRPC 连接池大小：单条 gRPC 通道会串行化并发请求，多条通道轮询
+# 分摊并发搜索的吞吐；1 表示保持单连接（默认行为）
+_POOL_SIZE = max(1, int(os.getenv("MILVUS_POOL_SIZE", "1")))
+
 
 class MilvusConnection:
     """Milvus 向量数据库连接管理类"""
 
     def __init__(self):
         self._client = None
-        self._connected = False
         self._database = None
+        self._database_initialized = False
+        self._health_checked_at = 0.0
+        self._health_ok = False
         self._should_create_default_collection = False
         self._default_collection_name = "agno_knowledge_default"
+        # 连接池：default 加若干 pool-N 别名，搜索路径轮询取用
+        self._aliases = ["default"]
+        self._rr = itertools.cycle(self._aliases)
 
     def _create_connection(self):
         """
@@ -51,34 +65,68 @@ class MilvusConnection:
             # 建立连接到 Milvus 服务器
             connections.connect(alias=alias, **connect_params)
             
-            # 检查数据库是否存在，如果不存在则创建
-            try:
-                databases = db.list_database()
-                if database not in databases:
-                    db.create_database(database)
-                    logger.debug(f"创建 Milvus 数据库: {database}")
-                else:
-                    logger.debug(f"Milvus 数据库 '{database}' 已存在")
-            except Exception as db_error:
-                # 某些版本的 Milvus 可能不支持多数据库功能，使用 default 数据库
-                if "database" in str(db_error).lower() or "not support" in str(db_error).lower():
-                    logger.warning(f"Milvus 版本可能不支持多数据库功能，使用 default 数据库: {db_error}")
-                    database = "default"
+            # 数据库存在性检查与切换只做一次：每次都 list_database 是
+            # 额外的网络往返，进程内重复连接时没有必要
+            if not self._database_initialized:
+                if os.environ.get("_MILVUS_DB_READY") == "1":
+                    # 数据库此前已确认存在（包括 close() 后的重连）：
+                    # 跳过 list/create，单次 using_database 往返即可
+                    try:
+                        db.using_database(database)
+                        logger.debug("已切换到 Milvus 数据库（跳过存在性检查）: %s", database)
+                    except Exception as switch_error:
+                        logger.debug("切换数据库时出现警告（可忽略）: %s", switch_error)
                 else:
-                    raise
+                    # 检查数据库是否存在，如果不存在则创建
+                    try:
+                        databases = db.list_database()
+                        if database not in databases:
+                            db.create_database(database)
+                            logger.debug("创建 Milvus 数据库: %s", database)
+                        else:
+                            logger.debug("Milvus 数据库 '%s' 已存在", database)
+                    except Exception as db_error:
+                        # 某些版本的 Milvus 可能不支持多数据库功能，使用 default 数据库
+                        if "database" in str(db_error).lower() or "not support" in str(db_error).lower():
+                            logger.warning("Milvus 版本可能不支持多数据库功能，使用 default 数据库: %s", db_error)
+                            database = "default"
+                        else:
+                            raise
+
+                    # 切换到目标数据库（如果支持）
+                    try:
+                        db.using_database(database)
+                        logger.debug("已切换到 Milvus 数据库: %s", database)
+                    except Exception as switch_error:
+                        # 某些版本可能不需要显式切换，或者已经在默认数据库
+                        logger.debug("切换数据库时出现警告（可忽略）: %s", switch_error)
+
+                    # 记录数据库已就绪，后续重连（含新实例）直接切换
+                    os.environ["_MILVUS_DB_READY"] = "1"
+
+                self._database_initialized = True
             
-            # 切换到目标数据库（如果支持）
-            try:
-                db.using_database(database)
-                logger.debug(f"已切换到 Milvus 数据库: {database}")
-            except Exception as switch_error:
-                # 某些版本可能不需要显式切换，或者已经在默认数据库
-                logger.debug(f"切换数据库时出现警告（可忽略）: {switch_error}")
-            
-            self._connected = True
             self._database = database
-            
-            logger.debug(f"成功连接到 Milvus: {host}:{port}, 数据库: {database}")
+
+            # 建立额外的池连接：每个别名一条独立 gRPC 通道，并发搜索
+            # 在通道间轮询分摊，避免全部请求在单通道上串行化
+            if _POOL_SIZE > 1:
+                aliases = ["default"]
+                for i in range(1, _POOL_SIZE):
+                    pool_alias = f"pool-{i}"
+                    try:
+                        connections.connect(alias=pool_alias, **connect_params)
+                        try:
+                            db.using_database(database, using=pool_alias)
+                        except Exception as switch_error:
+                            logger.debug("池连接切换数据库时出现警告（可忽略）: %s", switch_error)
+                        aliases.append(pool_alias)
+                    except Exception as pool_error:
+                        logger.warning("创建池连接 %s 失败（降级使用现有连接）: %s", pool_alias, pool_error)
+                self._aliases = aliases
+                self._rr = itertools.cycle(self._aliases)
+
+            logger.debug("成功连接到 Milvus: %s:%s, 数据库: %s", host, port, database)
             
             # 确保默认集合存在（延迟导入避免循环依赖）
             # 注意：这里延迟创建集合，避免在连接阶段触发循环依赖
@@ -89,8 +137,7 @@ class MilvusConnection:
             return True
 
         except Exception as e:
-            logger.error(f"Milvus 连接失败: {e}")
-            self._connected = False
+            logger.error("Milvus 连接失败: %s", e)
             raise
 
     @property
@@ -103,37 +150,64 @@ class MilvusConnection:
     @property
     def client(self):
         """获取 Milvus 客户端连接（pymilvus 使用全局连接）"""
-        if not self._connected:
+        # 以 pymilvus 自身的全局连接状态为准，避免本地标志与真实状态漂移
+        if not connections.has_connection("default"):
             self._create_connection()
         return True  # pymilvus 使用全局连接，返回 True 表示已连接
 
+    def get_search_alias(self) -> str:
+        """
+        轮询获取一个连接别名（供搜索等并发路径使用）
+
+        MILVUS_POOL_SIZE=1（默认）时恒为 "default"；大于1时在池内
+        各别名间轮询，使并发请求分摊到多条 gRPC 通道上。
+        """
+        if not connections.has_connection("default"):
+            self._create_connection()
+        return next(self._rr)
+
     def health_check(self) -> bool:
         """
-        Milvus 健康检查
+        Milvus 健康检查（结果带TTL缓存）
+
+        TTL内直接返回上次结果；探活本身使用 connections.has_connection
+        的本地状态检查，而不是 list_collections 这样的完整RPC。
 
         Returns:
             bool: 连接是否正常
         """
+        now = time.monotonic()
+        if now - self._health_checked_at < _HEALTH_CHECK_TTL:
+            return self._health_ok
+
         try:
-            if not self._connected:
+            if not connections.has_connection("default"):
                 self._create_connection()
-            
-            # 尝试列出集合来测试连接
-            collections = utility.list_collections()
-            return True
+
+            # 本地连接状态检查，避免每次探活都发起一次完整RPC
+            ok = connections.has_connection("default")
         except Exception as e:
-            logger.error(f"Milvus 健康检查失败: {e}")
-            return False
+            logger.error("Milvus 健康检查失败: %s", e)
+            ok = False
+
+        self._health_checked_at = now
+        self._health_ok = ok
+        return ok
 
     def close(self):
-        """关闭 Milvus 连接"""
+        """关闭 Milvus 连接（含池内全部别名）"""
         try:
-            if self._connected:
-                connections.disconnect("default")
-                self._connected = False
-                logger.debug("Milvus 连接已关闭")
+            for alias in self._aliases:
+                if connections.has_connection(alias):
+                    connections.disconnect(alias)
+            self._aliases = ["default"]
+            self._rr = itertools.cycle(self._aliases)
+            # 重连时必须重新执行数据库切换（_MILVUS_DB_READY 已置位时
+            # 只需单次 using_database），否则会落在 default 数据库上
+            self._database_initialized = False
+            logger.debug("Milvus 连接已关闭")
         except Exception as e:
-            logger.error(f"关闭 Milvus 连接失败: {e}")
+            logger.error("关闭 Milvus 连接失败: %s", e)
 
 
 # 全局 Milvus 连接实例
@@ -147,8 +221,6 @@ def get_milvus_client():
     Returns:
         bool: 连接状态（pymilvus 使用全局连接）
     """
-    if not milvus_connection._connected:
-        milvus_connection._create_connection()
     return milvus_connection.client
 
 
@@ -3,23 +3,99 @@ Milvus Vector Query Tools Module
 Milvus 向量查询工具，提供基本的向量数据库操作方法
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pymilvus import Collection, utility, FieldSchema, CollectionSchema, DataType
+import asyncio
+import concurrent.futures
+import functools
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
 from .connection import get_milvus_client, check_milvus_connection, milvus_connection
 
 logger = logging.getLogger(__name__)
 
+# 集合元数据（存在性/列表）缓存时长（秒）：搜索热路径上每次
+# collection_exists 都是一次RPC，短TTL内直接复用上次结果
+_METADATA_TTL = float(os.getenv("MILVUS_METADATA_TTL", "5"))
+
+# 语义结果缓存：相似度阈值>0时启用，近似重复的查询向量直接复用
+# 上次的搜索结果（亚毫秒返回），省掉整个ANN搜索往返
+_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("MILVUS_SEMANTIC_CACHE_THRESHOLD", "0"))
+_SEMANTIC_CACHE_TTL = float(os.getenv("MILVUS_SEMANTIC_CACHE_TTL", "300"))
+_SEMANTIC_CACHE_SIZE = int(os.getenv("MILVUS_SEMANTIC_CACHE_SIZE", "1024"))
+
+# 实体计数缓存时长（秒）：num_entities 需要服务端聚合统计，
+# 轮询式调用（如面板）在TTL内直接复用上次结果
+_COUNT_TTL = float(os.getenv("MILVUS_COUNT_TTL", "10"))
+
+# 向量字段类型集合：成员判断一次完成，并兼容 FP16/BF16/稀疏向量
+# （getattr 兜底，旧版 pymilvus 可能没有这些枚举成员）
+_VECTOR_DTYPES = frozenset(
+    dtype for dtype in (
+        getattr(DataType, name, None)
+        for name in ("FLOAT_VECTOR", "BINARY_VECTOR", "FLOAT16_VECTOR",
+                     "BFLOAT16_VECTOR", "SPARSE_FLOAT_VECTOR")
+    ) if dtype is not None
+)
+
 
 class VectorQueryTools:
     """Milvus 向量查询工具类"""
 
     def __init__(self):
         """初始化向量查询工具"""
+        # 元数据缓存：{(数据库, 集合名): (时间戳, 是否存在)} / {数据库: (时间戳, 集合列表)}
+        self._exists_cache: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+        self._list_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._count_cache: Dict[str, Tuple[float, int]] = {}
+        # Collection 对象缓存与已 load 集合记录：重复包装会反复解析
+        # schema，load() 每次都是一个服务端往返，均只做一次；
+        # 键含连接别名以配合连接池（MILVUS_POOL_SIZE>1 时）
+        self._collections: Dict[Tuple[str, str, str], Collection] = {}
+        self._loaded: set = set()
+        # 向量字段名缓存：schema 扫描每个集合只做一次
+        self._vector_field_cache: Dict[str, str] = {}
+        # output_fields 校验缓存：{(集合名, 字段元组): 校验后的列表}，
+        # 固定字段的调用方每个组合只做一次 schema 校验
+        self._output_fields_cache: Dict[Tuple[str, tuple], List[str]] = {}
+        # 搜索参数缓存：{集合名: (metric_type, index_type)}，索引元数据
+        # 每个集合只内省一次；最终参数字典按 (集合, limit, 度量) 驻留
+        # 复用（pymilvus 不会修改该字典，按引用传递安全），省掉每次
+        # 搜索的字典+嵌套字典分配
+        self._search_params_cache: Dict[str, Tuple[str, str]] = {}
+        self._search_params_final: Dict[Tuple[str, int, Optional[str]], Dict[str, Any]] = {}
+        # 多数据库能力模式："native"（支持 using_database）/
+        # "db_name"（只认 db_name 参数）/ "unsupported"（不支持多数据库），
+        # 首次用到非 default 数据库时探测一次并缓存，替代每次调用
+        # 都走一遍 try/except 探测梯子
+        self._db_mode: Optional[str] = None
+        # 语义结果缓存：{(集合, limit, expr, 向量bytes): (归一化向量, 时间戳, 结果)}
+        self._semantic_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # 语义缓存的堆叠矩阵：{(集合, limit, expr): (纪元号, 矩阵, 键列表)}，
+        # 矩阵只在缓存内容变化（纪元号递增）后重建一次，查询时直接
+        # 做一次BLAS矩阵乘，而不是每次查询都重新堆叠
+        self._semantic_mat_cache: Dict[tuple, Tuple[int, "np.ndarray", list]] = {}
+        self._semantic_epoch = 0
+        self._default_collection_name = os.getenv(
+            "MILVUS_DEFAULT_COLLECTION", "agno_knowledge_default")
+        # 默认集合就绪事件：创建在后台线程完成，启动不再阻塞在RPC上；
+        # 查询默认集合时先等待该事件（带超时）
+        self._default_ready = threading.Event()
         self._ensure_connection()
-        # 连接建立后，确保默认集合存在
-        self._ensure_default_collection_on_init()
+        # 连接建立后，在后台线程中确保默认集合存在（不阻塞启动）
+        threading.Thread(
+            target=self._ensure_default_collection_on_init,
+            name="milvus-ensure-default-collection",
+            daemon=True
+        ).start()
+        # 可选：启动时并发预热所有集合，把 load 延迟移出查询关键路径
+        if os.getenv("MILVUS_EAGER_LOAD") == "1":
+            self._eager_load_collections()
 
     def _ensure_connection(self):
         """确保 Milvus 连接已建立"""
@@ -27,47 +103,309 @@ class VectorQueryTools:
             get_milvus_client()
     
     def _ensure_default_collection_on_init(self):
-        """初始化时确保默认集合存在"""
+        """初始化时确保默认集合存在（在后台线程中执行）"""
         try:
             # 从环境变量读取配置，如果未提供则使用默认值
             self.ensure_default_collection()
         except Exception as e:
             # 集合创建失败不应该阻止工具初始化，只记录警告
             logger.warning(f"初始化时创建默认集合失败（可忽略）: {e}")
+        finally:
+            # 无论成败都置位：查询路径最多等待一次，不会永久阻塞
+            self._default_ready.set()
+
+    def _eager_load_collections(self):
+        """
+        启动时预热所有集合（MILVUS_EAGER_LOAD=1 时启用）
+
+        load() 在冷集合上是秒级操作；启动时用线程池对所有集合并发
+        load 一次并记入 _loaded，之后查询路径上的 _ensure_loaded 全部
+        命中记录，首次查询不再承担加载延迟。从不查询的进程不应设置
+        该环境变量，避免白白付出预热成本。
+        """
+        try:
+            names = self.list_collections()
+            if not names:
+                return
+
+            def _load(name: str):
+                self._ensure_loaded(name, self._get_collection(name))
+                return name
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+                for future in concurrent.futures.as_completed(
+                        pool.submit(_load, name) for name in names):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.warning(f"预热集合失败（可忽略）: {e}")
+            logger.debug(f"已预热 {len(names)} 个集合")
+        except Exception as e:
+            logger.warning(f"集合预热失败（可忽略）: {e}")
 
     def _get_database(self) -> str:
         """获取当前使用的数据库名称"""
         return milvus_connection.database
 
-    def _get_collection(self, collection_name: str) -> Collection:
+    def _resolve_db_mode(self, database: str) -> str:
         """
-        获取集合对象（支持指定数据库）
+        解析多数据库能力模式（只探测一次）
+
+        异常构建与栈回溯在热路径上开销可观；此前每个操作都带一条
+        三分支的 try/except 探测梯子。现在首次访问非 default 数据库
+        时探测一次 using_database 并缓存结论，之后每次调用只剩一个
+        普通分支判断。db_name 回退分支在首次 TypeError 时降级为
+        "unsupported"，同样只降级一次。
+        """
+        if not database or database == "default":
+            return "default"
+        if self._db_mode is None:
+            try:
+                from pymilvus import db
+                db.using_database(database)
+                self._db_mode = "native"
+            except Exception as e:
+                logger.debug(f"using_database 不可用，回退到 db_name 参数: {e}")
+                self._db_mode = "db_name"
+        return self._db_mode
+
+    def _get_collection(self, collection_name: str, alias: str = "default") -> Collection:
+        """
+        获取集合对象（支持指定数据库，进程内按 (数据库, 集合名, 别名) 缓存）
 
         Args:
             collection_name: 集合名称
+            alias: 连接别名（搜索路径传入池内轮询到的别名）
 
         Returns:
             Collection 对象
         """
         database = self._get_database()
-        # 如果数据库不是 default，先切换到该数据库，然后获取集合
-        if database and database != "default":
+
+        cache_key = (database, collection_name, alias)
+        collection = self._collections.get(cache_key)
+        if collection is not None:
+            return collection
+
+        collection = self._build_collection(database, collection_name, alias)
+        self._collections[cache_key] = collection
+        return collection
+
+    def _build_collection(
+        self, database: str, collection_name: str, alias: str = "default"
+    ) -> Collection:
+        """构建集合对象（多数据库模式走缓存的能力探测，仅在缓存未命中时调用）"""
+        mode = self._resolve_db_mode(database)
+        if mode == "db_name":
             try:
-                from pymilvus import db
-                # 切换到目标数据库
-                db.using_database(database)
-                # 获取集合对象
-                return Collection(collection_name)
-            except Exception as db_error:
-                # 如果切换数据库失败，尝试使用 db_name 参数（某些版本可能支持）
-                logger.debug(f"切换数据库获取集合失败，尝试其他方式: {db_error}")
-                try:
-                    return Collection(collection_name, db_name=database)
-                except TypeError:
-                    # 如果不支持 db_name 参数，使用默认数据库
-                    logger.warning(f"当前 pymilvus 版本不支持多数据库功能，使用默认数据库")
-                    return Collection(collection_name)
-        return Collection(collection_name)
+                return Collection(collection_name, db_name=database, using=alias)
+            except TypeError:
+                # 不支持 db_name 参数：记住结论，后续直接走默认数据库
+                logger.warning("当前 pymilvus 版本不支持多数据库功能，使用默认数据库")
+                self._db_mode = "unsupported"
+        # "native" 模式下连接/探测阶段已经 using_database 切换完成
+        return Collection(collection_name, using=alias)
+
+    def _semantic_cache_get(
+        self,
+        collection_name: str,
+        vectors: "np.ndarray",
+        limit: int,
+        expr: Optional[str]
+    ) -> Optional[Any]:
+        """
+        查询语义结果缓存
+
+        仅对单向量查询生效：同 (集合, limit, expr) 的归一化向量堆叠
+        成连续的 float32 矩阵（矩阵按纪元号缓存，只在缓存内容变化后
+        重建），一次BLAS矩阵乘算出全部余弦相似度（缓存向量入库时已
+        归一化，范数恒为1，矩阵乘即余弦），最高相似度达到阈值且未
+        过期时直接返回缓存结果。
+        """
+        if _SEMANTIC_CACHE_THRESHOLD <= 0 or len(vectors) != 1:
+            return None
+        try:
+            query = np.asarray(vectors[0], dtype=np.float32)
+            norm = float(np.linalg.norm(query))
+            if norm == 0:
+                return None
+            query = query / norm
+
+            group = (collection_name, limit, expr)
+            mat_entry = self._semantic_mat_cache.get(group)
+            if mat_entry is None or mat_entry[0] != self._semantic_epoch:
+                keys = [key for key in self._semantic_cache if key[0] == group]
+                if not keys:
+                    return None
+                mat = np.ascontiguousarray(
+                    np.stack([self._semantic_cache[key][0] for key in keys]))
+                mat_entry = (self._semantic_epoch, mat, keys)
+                self._semantic_mat_cache[group] = mat_entry
+
+            _, mat, keys = mat_entry
+            sims = mat @ query
+            best = int(np.argmax(sims))
+            if float(sims[best]) >= _SEMANTIC_CACHE_THRESHOLD:
+                key = keys[best]
+                entry = self._semantic_cache.get(key)
+                if entry is None:
+                    return None
+                if time.monotonic() - entry[1] >= _SEMANTIC_CACHE_TTL:
+                    # 最佳命中已过期：剔除并让矩阵在下次查询时重建
+                    del self._semantic_cache[key]
+                    self._semantic_epoch += 1
+                    return None
+                self._semantic_cache.move_to_end(key)
+                logger.debug(f"向量搜索语义缓存命中，相似度: {float(sims[best]):.4f}")
+                return entry[2]
+        except Exception as e:
+            # 缓存故障不影响搜索主流程
+            logger.debug(f"语义缓存查询失败（忽略）: {e}")
+        return None
+
+    def _semantic_cache_put(
+        self,
+        collection_name: str,
+        vectors: "np.ndarray",
+        limit: int,
+        expr: Optional[str],
+        results: Any
+    ):
+        """写入语义结果缓存并按LRU淘汰"""
+        if _SEMANTIC_CACHE_THRESHOLD <= 0 or len(vectors) != 1:
+            return
+        try:
+            query = np.asarray(vectors[0], dtype=np.float32)
+            norm = float(np.linalg.norm(query))
+            if norm == 0:
+                return
+            query = query / norm
+
+            key = ((collection_name, limit, expr), query.tobytes())
+            self._semantic_cache[key] = (query, time.monotonic(), results)
+            self._semantic_cache.move_to_end(key)
+            while len(self._semantic_cache) > _SEMANTIC_CACHE_SIZE:
+                self._semantic_cache.popitem(last=False)
+            # 内容已变化：递增纪元号使堆叠矩阵在下次查询时重建
+            self._semantic_epoch += 1
+        except Exception as e:
+            logger.debug(f"语义缓存写入失败（忽略）: {e}")
+
+    def _get_search_params(
+        self,
+        collection_name: str,
+        collection: Collection,
+        limit: int,
+        metric_type: Optional[str],
+        search_params: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        构建搜索参数（按集合内省索引元数据并缓存）
+
+        调用方显式传入的 search_params 原样使用；否则首次调用时从
+        collection.indexes 读取索引的 metric_type 与 index_type，
+        按索引类型给出合理默认值（HNSW 用 ef，IVF 系列用 nprobe），
+        不再对所有集合硬编码 L2/nprobe=10。内省结果按集合缓存，
+        后续调用零开销。
+        """
+        if search_params is not None:
+            if metric_type is not None:
+                search_params = {**search_params, "metric_type": metric_type}
+            return search_params
+
+        # 最终参数字典驻留：同 (集合, limit, 度量) 的调用直接复用
+        # 同一个字典对象，不再每次搜索都分配新字典
+        final_key = (collection_name, limit, metric_type)
+        final = self._search_params_final.get(final_key)
+        if final is not None:
+            return final
+
+        cached = self._search_params_cache.get(collection_name)
+        if cached is None:
+            index_metric, index_type = "L2", ""
+            try:
+                indexes = collection.indexes
+                if indexes:
+                    index_params = indexes[0].params or {}
+                    index_metric = index_params.get("metric_type", "L2")
+                    index_type = index_params.get("index_type", "")
+            except Exception as e:
+                logger.debug(f"内省集合索引参数失败，使用默认搜索参数: {e}")
+            cached = (index_metric, index_type)
+            self._search_params_cache[collection_name] = cached
+
+        index_metric, index_type = cached
+        if "HNSW" in index_type:
+            # HNSW 的候选队列长度：至少要 >= limit，放大到 2*limit
+            # 并保底 64，兼顾召回率与延迟
+            params = {"ef": max(limit * 2, 64)}
+        elif "DISKANN" in index_type:
+            params = {"search_list": max(limit * 2, 100)}
+        else:
+            # IVF 系列（含 IVF_SQ8 默认索引）及未知类型
+            params = {"nprobe": int(os.getenv("MILVUS_SEARCH_NPROBE", "16"))}
+
+        final = {"metric_type": metric_type or index_metric, "params": params}
+        self._search_params_final[final_key] = final
+        return final
+
+    def _validated_output_fields(
+        self,
+        collection_name: str,
+        collection: Collection,
+        output_fields: Optional[List[str]]
+    ) -> Optional[List[str]]:
+        """
+        校验并规整 output_fields（按 (集合, 字段元组) 缓存）
+
+        pymilvus 每次搜索都会按 schema 逐字段校验 output_fields；
+        固定字段的调用方这部分是重复工作，这里对每个组合只校验一次，
+        不存在的字段剔除并告警（只在首次），之后直接复用校验结果。
+        """
+        if not output_fields:
+            return None
+
+        cache_key = (collection_name, tuple(output_fields))
+        cached = self._output_fields_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        schema_fields = {field.name for field in collection.schema.fields}
+        validated = [name for name in output_fields if name in schema_fields]
+        unknown = [name for name in output_fields if name not in schema_fields]
+        if unknown:
+            logger.warning(f"集合 {collection_name} 中不存在的输出字段已忽略: {unknown}")
+
+        self._output_fields_cache[cache_key] = validated
+        return validated
+
+    def _ensure_loaded(self, collection_name: str, collection: Collection):
+        """确保集合已 load 到内存（每个集合每个进程只调用一次 load）"""
+        if collection_name not in self._loaded:
+            collection.load()
+            self._loaded.add(collection_name)
+
+    def _cached_list(self, database: str) -> List[str]:
+        """获取数据库的集合列表（TTL内复用缓存，过期才发起RPC）"""
+        cached = self._list_cache.get(database)
+        if cached is not None and time.monotonic() - cached[0] < _METADATA_TTL:
+            return cached[1]
+
+        mode = self._resolve_db_mode(database)
+        if mode == "db_name":
+            try:
+                collections = utility.list_collections(db_name=database)
+            except TypeError:
+                logger.warning(f"当前 pymilvus 版本不支持多数据库功能，无法列出数据库 {database} 的集合")
+                self._db_mode = "unsupported"
+                collections = []
+        elif mode == "unsupported":
+            collections = []
+        else:
+            collections = utility.list_collections()
+
+        self._list_cache[database] = (time.monotonic(), collections)
+        return collections
 
     def list_collections(self) -> List[str]:
         """
@@ -77,27 +415,7 @@ class VectorQueryTools:
             集合名称列表
         """
         try:
-            database = self._get_database()
-            if database and database != "default":
-                # 如果指定了数据库，先切换到该数据库，然后列出集合
-                try:
-                    from pymilvus import db
-                    # 切换到目标数据库
-                    db.using_database(database)
-                    # 列出集合
-                    collections = utility.list_collections()
-                except Exception as db_error:
-                    # 如果切换数据库失败，尝试使用 db_name 参数（某些版本可能支持）
-                    logger.debug(f"切换数据库列出集合失败，尝试其他方式: {db_error}")
-                    try:
-                        collections = utility.list_collections(db_name=database)
-                    except TypeError:
-                        # 如果不支持 db_name 参数，返回空列表或抛出错误
-                        logger.warning(f"当前 pymilvus 版本不支持多数据库功能，无法列出数据库 {database} 的集合")
-                        collections = []
-            else:
-                collections = utility.list_collections()
-            return collections
+            return self._cached_list(self._get_database())
         except Exception as e:
             logger.error(f"列出集合失败: {e}")
             raise
@@ -114,23 +432,30 @@ class VectorQueryTools:
         """
         try:
             database = self._get_database()
-            
-            # 如果指定了数据库，先切换到该数据库，然后检查集合
-            if database and database != "default":
+
+            # TTL内直接返回缓存的存在性结果，省掉搜索热路径上的一次RPC
+            cache_key = (database, collection_name)
+            cached = self._exists_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _METADATA_TTL:
+                return cached[1]
+
+            mode = self._resolve_db_mode(database)
+            if mode == "db_name":
+                # 优先常数级的服务端存在性查询，而不是为回答一个布尔值
+                # 拉取整个集合列表；has_collection 不可用时才退化为
+                # 成员判断（列表走TTL缓存）
                 try:
-                    from pymilvus import db
-                    # 切换到目标数据库
-                    db.using_database(database)
-                    # 检查集合是否存在
-                    return utility.has_collection(collection_name)
-                except Exception as db_error:
-                    # 如果切换数据库失败，尝试通过列出集合来检查
-                    logger.debug(f"切换数据库检查集合失败，使用列表方式: {db_error}")
-                    collections = utility.list_collections()
-                    return collection_name in collections
+                    exists = utility.has_collection(collection_name, db_name=database)
+                except Exception as probe_error:
+                    logger.debug(f"has_collection(db_name=...) 不可用，退化为列表判断: {probe_error}")
+                    exists = collection_name in self._cached_list(database)
+            elif mode == "unsupported":
+                exists = collection_name in self._cached_list(database)
             else:
-                # 默认数据库，直接检查
-                return utility.has_collection(collection_name)
+                exists = utility.has_collection(collection_name)
+
+            self._exists_cache[cache_key] = (time.monotonic(), exists)
+            return exists
         except Exception as e:
             logger.error(f"检查集合存在性失败: {collection_name}, 错误: {e}")
             raise
@@ -149,8 +474,9 @@ class VectorQueryTools:
             if not self.collection_exists(collection_name):
                 raise ValueError(f"集合 {collection_name} 不存在")
 
+            # 纯元数据读取：num_entities 与 schema 都不需要 load()，
+            # 冷集合上触发段加载是纯浪费，这里不做
             collection = self._get_collection(collection_name)
-            collection.load()
 
             # 获取集合统计信息
             num_entities = collection.num_entities
@@ -179,76 +505,152 @@ class VectorQueryTools:
     def search_vectors(
         self,
         collection_name: str,
-        vectors: List[List[float]],
+        vectors: Union["np.ndarray", List[List[float]]],
         limit: int = 10,
         expr: Optional[str] = None,
-        output_fields: Optional[List[str]] = None
+        output_fields: Optional[List[str]] = None,
+        metric_type: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         向量相似度搜索
 
         Args:
             collection_name: 集合名称
-            vectors: 查询向量列表
+            vectors: 查询向量，形如 (N, dim) 的 float32 ndarray 或嵌套列表
+                （列表会在入口转换一次；调用方直接传 ndarray 可省掉转换）
             limit: 返回结果数量
             expr: 过滤表达式（可选）
             output_fields: 需要返回的字段列表（可选）
+            metric_type: 距离度量（可选，默认取集合索引自身的度量）
+            search_params: 完整搜索参数字典（可选，传入时原样使用；
+                缺省时按索引类型自动构建，见 _get_search_params）
 
         Returns:
             搜索结果列表
         """
         try:
+            # 入口处统一为连续的 float32 二维数组：嵌套列表只转换一次，
+            # 避免后续语义缓存与 pymilvus 序列化各自再做逐元素转换
+            if not isinstance(vectors, np.ndarray) or vectors.dtype != np.float32 \
+                    or not vectors.flags['C_CONTIGUOUS']:
+                vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            if vectors.ndim == 1:
+                vectors = vectors.reshape(1, -1)
+            if vectors.ndim != 2:
+                raise ValueError(f"查询向量应为二维数组，实际维度: {vectors.ndim}")
+
+            # 语义缓存：近似重复的查询向量直接复用上次结果
+            cached = self._semantic_cache_get(collection_name, vectors, limit, expr)
+            if cached is not None:
+                return cached
+
+            # 默认集合的创建在后台线程进行：查询它时先等待就绪（带超时）
+            if (collection_name == self._default_collection_name
+                    and not self._default_ready.is_set()):
+                self._default_ready.wait(timeout=5)
+
             if not self.collection_exists(collection_name):
                 raise ValueError(f"集合 {collection_name} 不存在")
 
-            collection = self._get_collection(collection_name)
-            collection.load()
-
-            # 获取向量字段名（通常是第一个向量字段）
-            vector_field = None
-            for field in collection.schema.fields:
-                if field.dtype == DataType.FLOAT_VECTOR or field.dtype == DataType.BINARY_VECTOR:
-                    vector_field = field.name
-                    break
-
-            if not vector_field:
-                raise ValueError(f"集合 {collection_name} 中没有找到向量字段")
-
-            # 执行搜索
-            search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+            # 连接池启用时在别名间轮询，使并发搜索分摊到多条 gRPC 通道
+            alias = milvus_connection.get_search_alias()
+            collection = self._get_collection(collection_name, alias)
+            self._ensure_loaded(collection_name, collection)
+
+            # 获取向量字段名（首个向量字段，每个集合只扫描一次 schema）
+            vector_field = self._vector_field_cache.get(collection_name)
+            if vector_field is None:
+                for field in collection.schema.fields:
+                    if field.dtype in _VECTOR_DTYPES:
+                        vector_field = field.name
+                        break
+
+                if not vector_field:
+                    raise ValueError(f"集合 {collection_name} 中没有找到向量字段")
+                self._vector_field_cache[collection_name] = vector_field
+
+            # 执行搜索：参数与集合索引匹配（度量、ef/nprobe），而非硬编码
+            params = self._get_search_params(
+                collection_name, collection, limit, metric_type, search_params)
             results = collection.search(
                 data=vectors,
                 anns_field=vector_field,
-                param=search_params,
+                param=params,
                 limit=limit,
                 expr=expr,
-                output_fields=output_fields
+                output_fields=self._validated_output_fields(
+                    collection_name, collection, output_fields)
             )
 
-            # 格式化结果
-            formatted_results = []
-            for hits in results:
-                hit_list = []
-                for hit in hits:
-                    hit_data = {
+            # 格式化结果：hasattr 属性探测对首个命中做一次即可（所有命中
+            # 同构），逐命中的构建用推导式完成，省掉每条命中的重复探测
+            first_hit = results[0][0] if results and len(results[0]) > 0 else None
+            has_score = first_hit is not None and hasattr(first_hit, 'score')
+            has_entity = first_hit is not None and hasattr(first_hit, 'entity')
+
+            formatted_results = [
+                [
+                    {
                         "id": hit.id,
                         "distance": hit.distance,
-                        "score": hit.score if hasattr(hit, 'score') else None,
+                        "score": hit.score if has_score else None,
+                        # 附加其他字段（不返回向量数据）
+                        **({key: value for key, value in hit.entity.items()
+                            if key != vector_field}
+                           if has_entity and hit.entity else {}),
                     }
-                    # 添加其他字段
-                    if hasattr(hit, 'entity') and hit.entity:
-                        for key, value in hit.entity.items():
-                            if key != vector_field:  # 不返回向量数据
-                                hit_data[key] = value
-                    hit_list.append(hit_data)
-                formatted_results.append(hit_list)
+                    for hit in hits
+                ]
+                for hits in results
+            ]
 
-            return formatted_results[0] if len(formatted_results) == 1 else formatted_results
+            final_results = formatted_results[0] if len(formatted_results) == 1 else formatted_results
+            self._semantic_cache_put(collection_name, vectors, limit, expr, final_results)
+            return final_results
 
         except Exception as e:
             logger.error(f"向量搜索失败: {collection_name}, 错误: {e}")
             raise
 
+    async def search_vectors_async(
+        self,
+        collection_name: str,
+        vectors: Union["np.ndarray", List[List[float]]],
+        limit: int = 10,
+        expr: Optional[str] = None,
+        output_fields: Optional[List[str]] = None,
+        metric_type: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        search_vectors 的异步封装（线程池中执行，不阻塞事件循环）
+
+        参数与返回值同 search_vectors。
+        """
+        return await asyncio.to_thread(
+            self.search_vectors, collection_name, vectors, limit, expr,
+            output_fields, metric_type, search_params)
+
+    async def search_vectors_many(
+        self,
+        searches: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        并发执行多个独立的向量搜索
+
+        N 个独立搜索的总耗时约等于最慢一个的耗时，而不是各搜索
+        耗时之和，适合RAG场景下对多个子查询同时检索。
+
+        Args:
+            searches: 搜索参数字典列表，每项为 search_vectors_async 的关键字参数
+
+        Returns:
+            与输入顺序一致的搜索结果列表
+        """
+        return await asyncio.gather(
+            *(self.search_vectors_async(**search) for search in searches))
+
     def get_collection_count(self, collection_name: str) -> int:
         """
         获取集合中的实体数量
@@ -260,49 +662,91 @@ class VectorQueryTools:
             实体数量
         """
         try:
+            # num_entities 需要服务端做统计聚合，TTL内直接复用上次结果，
+            # 避免轮询调用把重复的计数RPC打到服务端
+            cached = self._count_cache.get(collection_name)
+            if cached is not None and time.monotonic() - cached[0] < _COUNT_TTL:
+                return cached[1]
+
             if not self.collection_exists(collection_name):
                 raise ValueError(f"集合 {collection_name} 不存在")
 
             collection = self._get_collection(collection_name)
-            return collection.num_entities
+            count = collection.num_entities
+            self._count_cache[collection_name] = (time.monotonic(), count)
+            return count
 
         except Exception as e:
             logger.error(f"获取集合数量失败: {collection_name}, 错误: {e}")
             raise
 
+    def invalidate_count(self, collection_name: str):
+        """使指定集合的计数缓存失效（写入数据后由插入路径调用）"""
+        self._count_cache.pop(collection_name, None)
+
     def create_collection(
         self,
         collection_name: str,
         dimension: int = None,
-        description: str = ""
+        description: str = "",
+        quantization: str = None
     ) -> bool:
         """
         创建集合
-        
+
         Args:
             collection_name: 集合名称
             dimension: 向量维度（如果为None，从环境变量MILVUS_DEFAULT_COLLECTION_DIMENSION读取，默认1536）
             description: 集合描述
-        
+            quantization: 向量量化方式 "fp32"/"fp16"/"int8"/"binary"
+                （如果为None，从环境变量MILVUS_VECTOR_QUANT读取，默认fp32）。
+                fp16 存储减半，int8 经索引层标量量化约降为1/4，
+                binary 约为1/32（度量自动切换为HAMMING）
+
         Returns:
             bool: 是否创建成功
         """
         # 如果未提供维度，从环境变量读取
         if dimension is None:
             dimension = int(os.getenv("MILVUS_DEFAULT_COLLECTION_DIMENSION", "1536"))
+        if quantization is None:
+            quantization = os.getenv("MILVUS_VECTOR_QUANT", "fp32")
+        quantization = quantization.lower()
         try:
             # 检查集合是否已存在
             if self.collection_exists(collection_name):
                 logger.debug(f"集合 {collection_name} 已存在，跳过创建")
                 return True
-            
+
             database = self._get_database()
-            
+
+            # 按量化方式选择向量字段类型与配套的索引/度量：向量数据
+            # 是内存带宽的主要消耗方，存储字节减半则带宽需求减半
+            vector_dtype = DataType.FLOAT_VECTOR
+            metric_type = os.getenv("MILVUS_METRIC_TYPE", "L2")
+            index_type = os.getenv("MILVUS_INDEX_TYPE", "IVF_SQ8")
+            if quantization == "fp16":
+                fp16_dtype = getattr(DataType, "FLOAT16_VECTOR", None)
+                if fp16_dtype is not None:
+                    vector_dtype = fp16_dtype
+                else:
+                    logger.warning("当前 pymilvus 版本不支持 FLOAT16_VECTOR，退回 fp32")
+            elif quantization == "binary":
+                vector_dtype = DataType.BINARY_VECTOR
+                metric_type = "HAMMING"
+                index_type = "BIN_IVF_FLAT"
+            elif quantization == "int8":
+                # Milvus 的标量量化在索引层完成：存储仍为FLOAT_VECTOR，
+                # 由 IVF_SQ8 索引把向量压缩到 INT8
+                index_type = "IVF_SQ8"
+            elif quantization != "fp32":
+                logger.warning(f"未知的量化方式 {quantization}，使用 fp32")
+
             # 定义字段
             fields = [
                 FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
                 FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535),
-                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=dimension),
+                FieldSchema(name="vector", dtype=vector_dtype, dim=dimension),
                 FieldSchema(name="metadata", dtype=DataType.VARCHAR, max_length=65535),
             ]
             
@@ -312,40 +756,62 @@ class VectorQueryTools:
                 description=description or f"知识库集合: {collection_name}"
             )
             
-            # 创建集合
-            if database and database != "default":
+            # 索引参数：默认 IVF_SQ8 做标量量化，向量从FP32压缩到
+            # INT8，索引内存和搜索时的内存带宽降为约四分之一，
+            # 相似度检索的精度损失可忽略；类型/度量随量化方式联动，
+            # 也可用环境变量覆盖。构建参数按索引家族给出：HNSW 用
+            # M/efConstruction，AUTOINDEX（Zilliz Cloud）不带参数，
+            # IVF 系列用 nlist —— 没有索引时搜索退化为O(N·D)暴力扫描
+            if "HNSW" in index_type:
+                build_params = {
+                    "M": int(os.getenv("MILVUS_INDEX_HNSW_M", "16")),
+                    "efConstruction": int(os.getenv("MILVUS_INDEX_HNSW_EF_CONSTRUCTION", "200")),
+                }
+            elif index_type == "AUTOINDEX":
+                build_params = {}
+            else:
+                build_params = {"nlist": int(os.getenv("MILVUS_INDEX_NLIST", "128"))}
+            index_params = {
+                "index_type": index_type,
+                "metric_type": metric_type,
+                "params": build_params,
+            }
+            
+            # 创建集合（多数据库模式走缓存的能力探测）
+            mode = self._resolve_db_mode(database)
+            if mode == "db_name":
                 try:
-                    from pymilvus import db
-                    # 切换到目标数据库
-                    db.using_database(database)
-                    # 在目标数据库中创建集合
+                    collection = Collection(
+                        name=collection_name,
+                        schema=schema,
+                        db_name=database
+                    )
+                except TypeError:
+                    logger.warning("当前 pymilvus 版本不支持多数据库功能，在默认数据库中创建集合")
+                    self._db_mode = "unsupported"
                     collection = Collection(
                         name=collection_name,
                         schema=schema
                     )
-                except Exception as db_error:
-                    # 如果切换数据库失败，尝试使用 db_name 参数（某些版本可能支持）
-                    logger.debug(f"切换数据库创建集合失败，尝试其他方式: {db_error}")
-                    try:
-                        collection = Collection(
-                            name=collection_name,
-                            schema=schema,
-                            db_name=database
-                        )
-                    except TypeError:
-                        # 如果不支持 db_name 参数，在默认数据库中创建
-                        logger.warning(f"当前 pymilvus 版本不支持多数据库功能，在默认数据库中创建集合")
-                        collection = Collection(
-                            name=collection_name,
-                            schema=schema
-                        )
             else:
                 collection = Collection(
                     name=collection_name,
                     schema=schema
                 )
             
-            logger.info(f"成功创建集合: {collection_name} (维度: {dimension})")
+            collection.create_index(field_name="vector", index_params=index_params)
+
+            # 刷新元数据缓存：新集合立即可见，数据库的集合列表与字段缓存失效
+            self._exists_cache[(database, collection_name)] = (time.monotonic(), True)
+            self._list_cache.pop(database, None)
+            self._vector_field_cache.pop(collection_name, None)
+            self._search_params_cache.pop(collection_name, None)
+            for key in [k for k in self._search_params_final if k[0] == collection_name]:
+                del self._search_params_final[key]
+            for key in [k for k in self._output_fields_cache if k[0] == collection_name]:
+                del self._output_fields_cache[key]
+
+            logger.info(f"成功创建集合: {collection_name} (维度: {dimension}, 索引: {index_params['index_type']})")
             return True
             
         except Exception as e:
@@ -391,11 +857,11 @@ class VectorQueryTools:
             raise
 
 
-# 全局向量查询工具实例
-vector_tools = VectorQueryTools()
-
-
+# 全局向量查询工具实例：懒加载单例。构造函数会建立 Milvus 连接并
+# 检查/创建默认集合，放在导入阶段会让所有导入方（含测试收集、
+# start.py）无条件承担网络IO，因此推迟到首次调用时才创建
+@functools.cache
 def get_vector_tools() -> VectorQueryTools:
-    """获取向量查询工具实例"""
-    return vector_tools
+    """获取向量查询工具实例（首次调用时创建并缓存）"""
+    return VectorQueryTools()
 
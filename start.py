@@ -29,6 +29,7 @@ if __name__ == "__main__":
     
     print(f"\n启动服务: http://{host}:{port}\n")
     
-    from src.main import agent_os, app
-    agent_os.serve(app=app, host=host, port=port, reload=args.reload)
+    import uvicorn
+    # AgentOS 在应用 lifespan 中延迟构建，这里直接用 uvicorn 启动
+    uvicorn.run("src.main:app", host=host, port=port, reload=args.reload)
 
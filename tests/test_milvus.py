@@ -107,7 +107,7 @@ def test_milvus_connection():
     # 测试 5: 连接状态
     print("\n[测试 5] 连接状态")
     try:
-        print(f"  连接状态: {'已连接' if milvus_connection._connected else '未连接'}")
+        print(f"  连接状态: {'已连接' if check_milvus_connection() else '未连接'}")
         print("  ✓ 连接状态检查成功")
     except Exception as e:
         print(f"  ✗ 检查连接状态失败: {e}")